@@ -2,104 +2,234 @@
 """Whale copy trading monitor for FollowMeABC123."""
 
 import os
+import sys
 import asyncio
+import random
+import time
 import httpx
-from datetime import datetime
+import orjson
+import websockets
 from dotenv import load_dotenv
 
+from src.services.http_clients import get_shared_client, close_shared_client
+
 load_dotenv()
 
-TRADER = os.getenv("USER_ADDRESSES", "").split(",")[0]
+TRADER = os.getenv("USER_ADDRESSES", "").partition(",")[0].strip()
+TRADER_LOWER = TRADER.lower()
 OUR_BANKROLL = float(os.getenv("BANKROLL", "433"))
 THEIR_AVG_BET = 100.0
 MAX_PCT = 0.15
 MAX_POSITION = OUR_BANKROLL * MAX_PCT
 
+# calculate_copy scale factors: 2% of bankroll per 100% of their avg bet
+_COPY_PER_DOLLAR = OUR_BANKROLL * 2.0 / 100 / THEIR_AVG_BET
+_PCT_PER_DOLLAR = 100 / OUR_BANKROLL
+
 API_URL = "https://data-api.polymarket.com"
+RTDS_URL = "wss://ws-live-data.polymarket.com"
+_RTDS_SUBSCRIBE = orjson.dumps({
+    "action": "subscribe",
+    "subscriptions": [{"topic": "activity", "type": "trades"}],
+}).decode()
+
+# Request header to send back for each response validator (conditional GET)
+_VALIDATORS = (("If-None-Match", "etag"), ("If-Modified-Since", "last-modified"))
+
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+
+# Poll fast while the whale is trading, back off (doubling) while idle
+POLL_MIN_SEC = float(os.getenv("POLL_MIN_SEC", "3"))
+POLL_MAX_SEC = float(os.getenv("POLL_MAX_SEC", "60"))
+ERROR_BASE_DELAY = 5.0
+ERROR_MAX_DELAY = 120.0
+
 last_tx = None
 
+# Fixed banner/row strings, built once
+_SEP70 = "=" * 70
+_DASH70 = "-" * 70
+_SEP50 = "   " + "=" * 50
+_ROW_FMT = "  ${bet:<6} → ${size:.2f} ({pct:.1f}%)"
+
 
 def calculate_copy(trader_bet: float) -> dict:
-    pct_of_avg = trader_bet / THEIR_AVG_BET
-    base_pct = pct_of_avg * 2.0  # 2% per 100% of avg
-    our_copy = (OUR_BANKROLL * base_pct) / 100
-    our_copy = min(our_copy, MAX_POSITION)
+    our_copy = trader_bet * _COPY_PER_DOLLAR
+    if our_copy > MAX_POSITION:
+        our_copy = MAX_POSITION
     our_copy = max(round(our_copy, 2), 1.0)
-    return {"size": our_copy, "pct": our_copy / OUR_BANKROLL * 100}
+    return {"size": our_copy, "pct": our_copy * _PCT_PER_DOLLAR}
+
+
+# Startup banner depends only on env-derived constants - format it once
+_STATUS = "\n".join((
+    _SEP70,
+    "🐋 WHALE COPY TRADING - FollowMeABC123",
+    _SEP70,
+    f"Our Bankroll:   ${OUR_BANKROLL}",
+    f"Their Avg Bet:  ${THEIR_AVG_BET}",
+    f"Max Position:   ${MAX_POSITION:.2f} ({MAX_PCT*100:.0f}%)",
+    "",
+    "Sizing (proportional to their avg bet):",
+    _DASH70,
+    *(_ROW_FMT.format(bet=bet, **calculate_copy(bet)) for bet in (25, 100, 500, 1000, 5000, 10000)),
+    _DASH70,
+))
 
 
 async def show_status():
-    print("=" * 70)
-    print("🐋 WHALE COPY TRADING - FollowMeABC123")
-    print("=" * 70)
-    print(f"Our Bankroll:   ${OUR_BANKROLL}")
-    print(f"Their Avg Bet:  ${THEIR_AVG_BET}")
-    print(f"Max Position:   ${MAX_POSITION:.2f} ({MAX_PCT*100:.0f}%)")
-    print()
-    print("Sizing (proportional to their avg bet):")
-    print("-" * 70)
+    print(_STATUS)
+
+
+def show_trade(trade: dict):
+    """Print a whale trade with our copy size."""
+    price = float(trade.get("price", 0))
+    # Activity API has usdcSize; RTDS payloads only carry shares and price
+    size = float(trade.get("usdcSize") or float(trade.get("size", 0)) * price)
+    side = trade.get("side", "")
+    title = trade.get("title", "Unknown")[:40]
+    outcome = trade.get("outcome", "")
+    
+    copy = calculate_copy(size)
     
-    for bet in [25, 100, 500, 1000, 5000, 10000]:
-        c = calculate_copy(bet)
-        print(f"  ${bet:<6} → ${c['size']:.2f} ({c['pct']:.1f}%)")
+    now = time.strftime("%H:%M:%S")
     
-    print("-" * 70)
+    # One write per signal instead of a print() (and flush) per line
+    sys.stdout.write(
+        f"\n🚨 [{now}] WHALE TRADE\n"
+        f"   📊 {title}\n"
+        f"   🎯 {outcome} @ ${price}\n"
+        f"   💰 Whale: {side} ${size:,.2f} ({size/THEIR_AVG_BET*100:.0f}% of avg)\n"
+        f"{_SEP50}\n"
+        f"   💵 COPY: ${copy['size']:.2f} ({copy['pct']:.1f}% of bank)\n"
+        f"{_SEP50}\n"
+        f"{_DASH70}\n"
+    )
+    sys.stdout.flush()
+
+
+async def monitor_stream():
+    """Push-based monitor: RTDS trade stream, filtered to TRADER."""
+    await show_status()
+    global last_tx
+    
+    print()
+    print("Streaming trades from RTDS... (Ctrl+C to stop)")
+    print(_DASH70)
+    
+    delay = RECONNECT_BASE_DELAY
+    while True:
+        try:
+            async with websockets.connect(RTDS_URL) as ws:
+                delay = RECONNECT_BASE_DELAY
+                await ws.send(_RTDS_SUBSCRIBE)
+                
+                async for message in ws:
+                    if not message:
+                        continue
+                    # A bad frame (e.g. a text ping) is skipped, not a reason to reconnect
+                    try:
+                        data = orjson.loads(message)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if not isinstance(data, dict) or data.get("type") != "trades":
+                        continue
+                    
+                    trade = data.get("payload")
+                    if not isinstance(trade, dict):
+                        continue
+                    if str(trade.get("proxyWallet", "")).lower() != TRADER_LOWER:
+                        continue
+                    
+                    tx_hash = trade.get("transactionHash", "")
+                    if tx_hash and tx_hash != last_tx:
+                        last_tx = tx_hash
+                        try:
+                            show_trade(trade)
+                        except (TypeError, ValueError) as e:
+                            print(f"Skipping malformed trade {tx_hash}: {e}")
+        
+        except (websockets.WebSocketException, OSError) as e:
+            print(f"Error: {e}")
+        
+        print(f"Reconnecting in {delay:.0f}s...")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RECONNECT_MAX_DELAY)
 
 
 async def monitor():
+    """Poll-based monitor: /activity with idle backoff (fallback for --poll)."""
     await show_status()
     global last_tx
     
     print()
     print("Monitoring for trades... (Ctrl+C to stop)")
-    print("-" * 70)
+    print(_DASH70)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    client = get_shared_client()
+    idle_count = 0
+    error_count = 0
+    # Fixed-shape request, built once; only the conditional-GET headers change
+    req = client.build_request("GET", f"{API_URL}/activity", params={"user": TRADER})
+    last_body = b""
+    try:
         while True:
             try:
-                resp = await client.get(f"{API_URL}/activity", params={"user": TRADER})
+                resp = await client.send(req)
+                if resp.status_code >= 400:
+                    # 429/5xx take the error backoff below (a 304 is fine)
+                    resp.raise_for_status()
+                error_count = 0
                 
-                if resp.status_code == 200:
-                    data = resp.json()
-                    trades = [t for t in data if t.get("type") == "TRADE"]
+                # A 304 Not Modified, or a byte-identical body when the server
+                # sends no validators, skips decoding and counts as an idle poll
+                if resp.status_code == 200 and resp.content != last_body:
+                    last_body = resp.content
+                    for header, validator in _VALIDATORS:
+                        if value := resp.headers.get(validator):
+                            req.headers[header] = value
+                        else:
+                            req.headers.pop(header, None)
+                    
+                    data = orjson.loads(resp.content)
+                    # Newest first - stop at the first TRADE entry; an error
+                    # object or odd rows are skipped like an idle poll
+                    latest = None
+                    if isinstance(data, list):
+                        latest = next(
+                            (t for t in data if isinstance(t, dict) and t.get("type") == "TRADE"), None
+                        )
                     
-                    if trades:
-                        latest = trades[0]
+                    if latest:
                         tx_hash = latest.get("transactionHash", "")
                         
                         if tx_hash and tx_hash != last_tx:
                             last_tx = tx_hash
-                            
-                            size = float(latest.get("usdcSize", 0))
-                            side = latest.get("side", "")
-                            price = float(latest.get("price", 0))
-                            title = latest.get("title", "Unknown")[:40]
-                            outcome = latest.get("outcome", "")
-                            
-                            copy = calculate_copy(size)
-                            
-                            now = datetime.now().strftime("%H:%M:%S")
-                            
-                            print()
-                            print(f"🚨 [{now}] WHALE TRADE")
-                            print(f"   📊 {title}")
-                            print(f"   🎯 {outcome} @ ${price}")
-                            print(f"   💰 Whale: {side} ${size:,.2f} ({size/THEIR_AVG_BET*100:.0f}% of avg)")
-                            print(f"   {'='*50}")
-                            print(f"   💵 COPY: ${copy['size']:.2f} ({copy['pct']:.1f}% of bank)")
-                            print(f"   {'='*50}")
-                            
-                            print("-" * 70)
+                            idle_count = 0  # Snap back to POLL_MIN_SEC
+                            try:
+                                show_trade(latest)
+                            except (TypeError, ValueError) as e:
+                                print(f"Skipping malformed trade {tx_hash}: {e}")
                 
-                await asyncio.sleep(3)
+                delay = min(POLL_MIN_SEC * 2 ** idle_count, POLL_MAX_SEC)
+                idle_count = min(idle_count + 1, 16)
+                # Jitter so several monitors don't poll in lockstep
+                await asyncio.sleep(delay + random.uniform(0, 1))
                 
-            except Exception as e:
+            except (httpx.HTTPError, ValueError) as e:
+                # Back off harder on repeated failures instead of retrying every 5s
                 print(f"Error: {e}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(min(ERROR_BASE_DELAY * 2 ** error_count, ERROR_MAX_DELAY))
+                error_count = min(error_count + 1, 16)
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
+    if not TRADER:
+        sys.exit("❌ USER_ADDRESSES not set - no trader to monitor")
     try:
-        asyncio.run(monitor())
+        asyncio.run(monitor() if "--poll" in sys.argv else monitor_stream())
     except KeyboardInterrupt:
         print("\n\nStopped.")
@@ -13,7 +13,7 @@ Usage:
 import os
 import sys
 import time
-import json
+import orjson
 import argparse
 import requests
 from datetime import datetime
@@ -26,6 +26,7 @@ from src.services.kalshi_executor import KalshiExecutor, KalshiCopyConfig, creat
 from src.services.market_matcher import MarketMatcher
 from src.services.kelly_calculator import KellyCalculator
 from src.services.risk_manager import RiskManager
+from src.services.trade_dedup import SeenTrades
 
 from src.config.traders import get_active_traders
 
@@ -47,7 +48,7 @@ def fetch_whale_trades(wallet_address: str, limit: int = 20) -> list:
             timeout=30  # Increased from 10 to 30 seconds
         )
         if resp.ok:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             return data.get("activity", []) if isinstance(data, dict) else data
     except Exception as e:
         print(f"Error fetching whale trades: {e}")
@@ -132,7 +133,7 @@ def main():
     print()
 
     print("Monitoring for whale trades...")
-    seen_trades = set()
+    seen_trades = SeenTrades()
     scan_count = 0
     spinner = "|/-\\"
 
@@ -150,8 +151,7 @@ def main():
             new_trades = []
             for trade in all_trades:
                 trade_id = trade.get("conditionId") or trade.get("transactionHash") or trade.get("id")
-                if trade_id and trade_id not in seen_trades:
-                    seen_trades.add(trade_id)
+                if trade_id and seen_trades.add(trade_id):
                     new_trades.append(trade)
 
             if new_trades:
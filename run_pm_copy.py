@@ -6,7 +6,8 @@ No sports filter - copies ALL markets!
 
 import asyncio
 import os
-import json
+import orjson
+import random
 import sys
 import time
 from datetime import datetime
@@ -18,10 +19,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
 from src.config.traders import get_active_traders
-from src.services.pm_executor import PolymarketCopyExecutor, PMCopyConfig
+from src.services.pm_executor import PolymarketCopyExecutor, PMCopyConfig, start_log_listener, use_fast_event_loop
+from src.services.trade_dedup import SeenTrades
 
 POLYMARKET_ACTIVITY_API = "https://data-api.polymarket.com/activity"
 FETCH_INTERVAL = 15  # Slower polling to avoid Cloudflare
+MAX_CONCURRENT_FETCHES = int(os.getenv("PM_MAX_CONCURRENT_FETCHES", "4"))
 
 
 def fetch_whale_trades(wallet_address: str, limit: int = 20) -> list:
@@ -45,7 +48,7 @@ def fetch_whale_trades(wallet_address: str, limit: int = 20) -> list:
             timeout=30
         )
         if resp.ok:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             # Handle both list and dict formats
             if isinstance(data, list):
                 return data
@@ -57,6 +60,78 @@ def fetch_whale_trades(wallet_address: str, limit: int = 20) -> list:
     return []
 
 
+async def scan_all_wallets(traders: list, sem: asyncio.Semaphore) -> list:
+    """Fetch every trader's activity concurrently, bounded by ``sem``.
+
+    Returns ``(trader, trades_or_exception)`` pairs in ``traders`` order.
+    """
+    async def fetch(trader):
+        async with sem:
+            return await asyncio.to_thread(fetch_whale_trades, trader, 20)
+
+    results = await asyncio.gather(*(fetch(t) for t in traders), return_exceptions=True)
+    return list(zip(traders, results))
+
+
+async def next_scan(scans: asyncio.Queue, producer: asyncio.Task) -> list:
+    """Wait for the next scan, re-raising if the producer died instead of blocking forever."""
+    getter = asyncio.ensure_future(scans.get())
+    try:
+        await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if not getter.done():
+            getter.cancel()
+    if getter.done() and not getter.cancelled():
+        return getter.result()
+    # Producer finished first: surface its exception (or stop if it just returned)
+    producer.result()
+    raise RuntimeError("scan producer stopped unexpectedly")
+
+
+async def poll_scans(traders: list, scans: asyncio.Queue):
+    """Producer: scan on a jittered interval, keeping only the freshest scan.
+
+    ``scans`` has maxsize 1; if the consumer is still busy copying when a new
+    scan lands, the stale one is dropped instead of queueing up behind it.
+    """
+    fetch_sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    error_count = 0
+    max_errors = 5
+    base_delay = FETCH_INTERVAL
+    
+    while True:
+        all_trades = []
+        fetch_success = True
+        
+        # Fetch trades from all traders concurrently
+        for trader, trades in await scan_all_wallets(traders, fetch_sem):
+            if isinstance(trades, Exception):
+                fetch_success = False
+                error_count += 1
+                if error_count >= max_errors:
+                    print(f"\n⚠️  Too many API errors ({error_count}), backing off...")
+                    # Exponential backoff
+                    delay = min(base_delay * (2 ** (error_count - max_errors)), 300)  # Max 5 min
+                    print(f"   Waiting {delay}s before retry...")
+                    await asyncio.sleep(delay)
+                    error_count = 0  # Reset after backoff
+                continue
+            for t in trades:
+                t['_trader_address'] = trader
+            all_trades.extend(trades)
+        
+        # Reset error count on success
+        if fetch_success:
+            error_count = max(0, error_count - 1)
+        
+        if scans.full():
+            scans.get_nowait()
+        scans.put_nowait(all_trades)
+        
+        # Add jitter to avoid detection
+        await asyncio.sleep(FETCH_INTERVAL * random.uniform(0.5, 1.5))
+
+
 async def main():
     """Main bot loop for PM copy trading."""
     
@@ -91,48 +166,22 @@ async def main():
     print(f"Copies: ALL markets (sports, politics, crypto, etc.)")
     print("-"*60)
     
-    # Main loop
-    seen_trades = set()
+    # Main loop: poll_scans produces, we consume the latest scan
+    seen_trades = SeenTrades()
     scan_count = 0
-    error_count = 0
-    max_errors = 5
-    base_delay = FETCH_INTERVAL
+    scans: asyncio.Queue = asyncio.Queue(maxsize=1)
+    producer = asyncio.create_task(poll_scans(traders, scans))
     
     try:
         while True:
+            all_trades = await next_scan(scans, producer)
             scan_count += 1
-            all_trades = []
-            fetch_success = True
-            
-            # Fetch trades from all traders
-            for trader in traders:
-                try:
-                    trades = fetch_whale_trades(trader, limit=20)
-                    for t in trades:
-                        t['_trader_address'] = trader
-                    all_trades.extend(trades)
-                except Exception as e:
-                    fetch_success = False
-                    error_count += 1
-                    if error_count >= max_errors:
-                        print(f"\n⚠️  Too many API errors ({error_count}), backing off...")
-                        # Exponential backoff
-                        delay = min(base_delay * (2 ** (error_count - max_errors)), 300)  # Max 5 min
-                        print(f"   Waiting {delay}s before retry...")
-                        await asyncio.sleep(delay)
-                        error_count = 0  # Reset after backoff
-                    continue
-            
-            # Reset error count on success
-            if fetch_success:
-                error_count = max(0, error_count - 1)
             
             # Filter new trades
             new_trades = []
             for trade in all_trades:
                 trade_id = trade.get("conditionId") or trade.get("transactionHash") or trade.get("id")
-                if trade_id and trade_id not in seen_trades:
-                    seen_trades.add(trade_id)
+                if trade_id and seen_trades.add(trade_id):
                     new_trades.append(trade)
             
             if new_trades:
@@ -155,17 +204,19 @@ async def main():
             else:
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] Scanning... ({scan_count} scans, {len(seen_trades)} seen)", end="\r")
             
-            # Add jitter to avoid detection
-            import random
-            jitter = random.uniform(0.5, 1.5)
-            await asyncio.sleep(FETCH_INTERVAL * jitter)
-            
     except KeyboardInterrupt:
         print("\n\nStopping PM Copy Bot...")
         await executor.close()
         print(f"Total trades copied: {len(executor.positions)}")
         print(f"Total exposure: ${executor.total_exposure:.2f}")
+    finally:
+        producer.cancel()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    use_fast_event_loop()
+    listener = start_log_listener()
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()
@@ -7,13 +7,17 @@ Uses HTTP API (same as Kalshi) instead of WebSocket
 import os
 import asyncio
 import requests
-import json
+import orjson
 import time
+from collections import defaultdict
 from datetime import datetime
+from typing import Dict
 from dotenv import load_dotenv
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import ApiCreds, OrderArgs
 
+from src.services.trade_dedup import SeenTrades
+
 load_dotenv()
 
 # Same traders as Kalshi bot
@@ -37,7 +41,9 @@ class PMHTTPBot:
         self.max_position = float(os.getenv("PM_MAX_POSITION_SIZE", "2.0"))
         self.max_total = float(os.getenv("PM_MAX_TOTAL_EXPOSURE", "10.0"))
         self.dry_run = os.getenv("PM_DRY_RUN", "true").lower() == "true"
-        self.seen_trades = set()
+        # One per whale: the early-exit below assumes a single newest-first feed
+        self.seen_trades: Dict[str, SeenTrades] = defaultdict(SeenTrades)
+        self.scan_count = 0
         self.setup_clob()
         
     def setup_clob(self):
@@ -76,7 +82,7 @@ class PMHTTPBot:
             )
             
             if resp.ok:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 if isinstance(data, list):
                     return data
                 elif isinstance(data, dict):
@@ -115,7 +121,7 @@ class PMHTTPBot:
         return True, "live"
     
     async def run(self):
-        """Main loop - same as Kalshi."""
+        """Main loop - one polling task per whale under a TaskGroup."""
         print("="*60)
         print("PM COPY BOT - Same Trades as Kalshi")
         print("="*60)
@@ -125,30 +131,37 @@ class PMHTTPBot:
         print(f"Monitoring {len(TRADERS)} whales...")
         print("-"*60)
         
-        scan_count = 0
-        
-        try:
-            while True:
-                scan_count += 1
-                all_trades = []
-                
-                # Fetch from all traders (same as Kalshi)
-                for trader in TRADERS:
-                    trades = self.fetch_whale_trades(trader)
-                    for t in trades:
-                        t['_trader'] = trader
-                    all_trades.extend(trades)
+        async with asyncio.TaskGroup() as tg:
+            for trader in TRADERS:
+                tg.create_task(self.watch_trader(trader))
+    
+    async def watch_trader(self, trader):
+        """Poll one whale; errors back off this trader only, not the others."""
+        delay = FETCH_INTERVAL
+        while True:
+            try:
+                trades = await asyncio.to_thread(self.fetch_whale_trades, trader)
                 
-                # Filter new trades
+                # Filter new trades - activity is newest-first, so the first
+                # already-seen hash means everything older was seen too
+                seen = self.seen_trades[trader]
+                scanned = set()
                 new_trades = []
-                for trade in all_trades:
+                for trade in trades:
                     trade_id = trade.get("transactionHash") or trade.get("id")
-                    if trade_id and trade_id not in self.seen_trades:
-                        self.seen_trades.add(trade_id)
-                        new_trades.append(trade)
+                    if not trade_id:
+                        continue
+                    if trade_id in scanned:
+                        continue  # another row of a tx added earlier in this scan
+                    if not seen.add(trade_id):
+                        break
+                    scanned.add(trade_id)
+                    trade['_trader'] = trader
+                    new_trades.append(trade)
                 
+                self.scan_count += 1
                 if new_trades:
-                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Found {len(new_trades)} trades")
+                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Found {len(new_trades)} trades from {trader[:10]}")
                     
                     for trade in new_trades:
                         success, msg = await self.execute_trade(trade)
@@ -157,14 +170,18 @@ class PMHTTPBot:
                     
                     print(f"   📊 Total PM exposure: ${self.total_exposure:.2f}")
                 else:
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Scanning... ({scan_count} scans)", end="\r")
-                
-                await asyncio.sleep(FETCH_INTERVAL)
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Scanning... ({self.scan_count} scans)", end="\r")
                 
-        except KeyboardInterrupt:
-            print("\n\nStopped.")
-
+                delay = FETCH_INTERVAL
+            except Exception as e:
+                delay = min(delay * 2, 300)  # Max 5 min
+                print(f"\n⚠️  {trader[:10]}: {e} - retrying in {delay}s")
+            
+            await asyncio.sleep(delay)
 
 if __name__ == "__main__":
     bot = PMHTTPBot()
-    asyncio.run(bot.run())
+    try:
+        asyncio.run(bot.run())
+    except KeyboardInterrupt:
+        print("\n\nStopped.")
@@ -5,12 +5,14 @@ Replaces blocked HTTP API with WebSocket connection
 """
 
 import os
-import json
+import orjson
 import asyncio
 import websockets
 from datetime import datetime
 from dotenv import load_dotenv
 
+from src.services.trade_dedup import SeenTrades
+
 load_dotenv()
 
 # Settings
@@ -21,6 +23,10 @@ TRADERS = [
     "0xd0b4c4c0234219f1dd41c9f6c0c798df95bc99d5",  # FollowMeABC123
     "0x5c3a1a60b5a8a051351cd0c88e1139311684a471",  # Additional whale
 ]
+TRADER_SET = frozenset(t.lower() for t in TRADERS)
+
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
 
 
 class PMWebSocketBot:
@@ -32,37 +38,42 @@ class PMWebSocketBot:
         self.max_position = float(os.getenv("PM_MAX_POSITION_SIZE", "2.0"))
         self.max_total = float(os.getenv("PM_MAX_TOTAL_EXPOSURE", "10.0"))
         self.dry_run = os.getenv("PM_DRY_RUN", "true").lower() == "true"
-        self.seen_trades = set()
+        self.seen_trades = SeenTrades()
         
     async def connect(self):
-        """Connect to RTDS WebSocket."""
-        try:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] Connecting to PM RTDS...")
-            
-            async with websockets.connect(RTDS_URL) as ws:
-                print(f"✓ Connected to RTDS")
+        """Connect to RTDS WebSocket, reconnecting with exponential backoff."""
+        delay = RECONNECT_BASE_DELAY
+        while True:
+            try:
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Connecting to PM RTDS...")
                 
-                # Subscribe to activity feed (correct format)
-                subscribe_msg = {
-                    "action": "subscribe",
-                    "subscriptions": [
-                        {
-                            "topic": "activity",
-                            "type": "trades"
-                        }
-                    ]
-                }
-                await ws.send(json.dumps(subscribe_msg))
-                print(f"✓ Subscribed to trades")
-                
-                # Listen for messages
-                async for message in ws:
-                    await self.handle_message(message)
+                async with websockets.connect(RTDS_URL) as ws:
+                    print(f"✓ Connected to RTDS")
+                    delay = RECONNECT_BASE_DELAY
                     
-        except Exception as e:
-            print(f"❌ WebSocket error: {e}")
-            await asyncio.sleep(5)
-            await self.connect()  # Reconnect
+                    # Subscribe to activity feed (correct format)
+                    subscribe_msg = {
+                        "action": "subscribe",
+                        "subscriptions": [
+                            {
+                                "topic": "activity",
+                                "type": "trades"
+                            }
+                        ]
+                    }
+                    await ws.send(orjson.dumps(subscribe_msg).decode())
+                    print(f"✓ Subscribed to trades")
+                    
+                    # Listen for messages
+                    async for message in ws:
+                        await self.handle_message(message)
+                        
+            except Exception as e:
+                print(f"❌ WebSocket error: {e}")
+            
+            print(f"   Reconnecting in {delay:.0f}s...")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
     
     async def handle_message(self, message):
         """Process incoming trade."""
@@ -70,23 +81,21 @@ class PMWebSocketBot:
             # Skip empty messages
             if not message:
                 return
-            data = json.loads(message)
+            data = orjson.loads(message)
             
             # Check if it's a trade message
             if data.get("type") != "trades":
                 return
             
             trade = data.get("payload", {})
-            trade_id = trade.get("transactionHash", "")
-            
-            # Skip if already seen
-            if trade_id in self.seen_trades:
-                return
-            self.seen_trades.add(trade_id)
             
             # Check if from our whales
             trader = trade.get("proxyWallet", "").lower()
-            if trader not in [t.lower() for t in TRADERS]:
+            if trader not in TRADER_SET:
+                return
+            
+            # Skip if already seen
+            if not self.seen_trades.add(trade.get("transactionHash", "")):
                 return
             
             # Process whale trade
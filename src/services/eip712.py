@@ -0,0 +1,51 @@
+"""
+EIP-712 helpers for Polymarket CTF Exchange orders
+
+One domain separator, digest and signing implementation shared by the CLOB
+executors.
+"""
+
+import coincurve
+from eth_abi import encode as abi_encode
+from eth_utils import keccak
+
+# EIP-712 domain for the Polymarket CTF Exchange on Polygon
+CHAIN_ID = 137
+EXCHANGE_ADDRESS = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
+EIP712_DOMAIN_TYPEHASH = keccak(
+    text="EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+)
+
+
+def domain_separator(
+    name: str = "Polymarket CTF Exchange",
+    version: str = "1",
+    chain_id: int = CHAIN_ID,
+    verifying_contract: str = EXCHANGE_ADDRESS,
+) -> bytes:
+    """keccak(typehash || keccak(name) || keccak(version) || chainId || verifyingContract)."""
+    return keccak(abi_encode(
+        ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+        [
+            EIP712_DOMAIN_TYPEHASH,
+            keccak(text=name),
+            keccak(text=version),
+            chain_id,
+            verifying_contract,
+        ]
+    ))
+
+
+# Depends only on constants - computed once at import
+EXCHANGE_DOMAIN = domain_separator()
+
+
+def typed_data_digest(struct_hash: bytes, domain: bytes = EXCHANGE_DOMAIN) -> bytes:
+    """EIP-712 signing digest: keccak(0x1901 || domainSeparator || structHash)."""
+    return keccak(b"\x19\x01" + domain + struct_hash)
+
+
+def sign_digest(signer: coincurve.PrivateKey, digest: bytes) -> str:
+    """Sign a 32-byte digest with libsecp256k1; returns 0x-hex r || s || v (v = 27/28)."""
+    signature = signer.sign_recoverable(digest, hasher=None)
+    return "0x" + signature[:64].hex() + format(signature[64] + 27, "02x")
@@ -0,0 +1,45 @@
+"""
+Shared HTTP client
+
+One process-wide httpx.AsyncClient so every Polymarket caller reuses the
+same keep-alive pool instead of paying a TCP+TLS handshake per client.
+"""
+
+from typing import Optional
+
+import httpx
+
+_DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Origin": "https://polymarket.com",
+    "Referer": "https://polymarket.com/"
+}
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=200,
+                keepalive_expiry=60
+            ),
+            headers=_DEFAULT_HEADERS
+        )
+    return _shared_client
+
+
+async def close_shared_client():
+    """Close the shared client; call once at process shutdown."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -8,6 +8,7 @@ import os
 import tempfile
 from dataclasses import dataclass
 from typing import Optional
+import orjson
 import requests
 from dotenv import load_dotenv
 
@@ -58,7 +59,7 @@ class KalshiClient:
             if not resp.ok:
                 return {}
 
-            data = resp.json()
+            data = orjson.loads(resp.content)
             markets = data.get('markets', [])
 
             for m in markets:
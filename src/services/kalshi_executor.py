@@ -11,6 +11,7 @@ Implements:
 import os
 import time
 import json
+import orjson
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
 from datetime import datetime
@@ -26,6 +27,19 @@ from src.services.risk_manager import RiskManager, RiskLevel
 TRADE_LOG = 'data/trades/kalshi_copies.json'
 
 
+def _log_timestamp(ts: Any) -> Optional[float]:
+    """Unix time of a trade-log timestamp (ISO string or number), None if unparseable."""
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    try:
+        return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        try:
+            return float(ts)
+        except (ValueError, TypeError):
+            return None
+
+
 @dataclass
 class KalshiCopyConfig:
     enabled: bool = False
@@ -331,7 +345,7 @@ class KalshiExecutor:
             self.positions_by_side[side_key] = self.positions_by_side.get(side_key, 0.0) + position_size
             return TradeResult(
                 success=True,
-                trade_id=f"dry_{int(time.time())}",
+                trade_id=f"dry_{time.time_ns()}",  # ns resolution: unique under bursts
                 pm_trade=pm_trade_data,
                 kalshi_market=match,
                 position_size=position_size,
@@ -382,8 +396,8 @@ class KalshiExecutor:
     def _log_trade(self, pm_trade: dict, match: MarketMatch, size: float, order_id: str):
         """Log executed trade and update position tracking."""
         try:
-            with open(TRADE_LOG, 'r') as f:
-                trades = json.load(f)
+            with open(TRADE_LOG, 'rb') as f:
+                trades = orjson.loads(f.read())
         except:
             trades = []
 
@@ -405,8 +419,9 @@ class KalshiExecutor:
 
         trades.append(trade)
 
-        with open(TRADE_LOG, 'w') as f:
-            json.dump(trades, f, indent=2)
+        # orjson re-serializes the whole log far faster than json.dump; same layout
+        with open(TRADE_LOG, 'wb') as f:
+            f.write(orjson.dumps(trades, option=orjson.OPT_INDENT_2))
 
         # Update position tracking (DOLLAR-based)
         self.positions_by_market[match.game_key] = self.positions_by_market.get(match.game_key, 0.0) + size
@@ -465,23 +480,15 @@ class KalshiExecutor:
             return False
 
         cutoff = time.time() - (cooldown_minutes * 60)
-        recent = []
-        for t in trades:
-            ts = t.get("timestamp", 0)
-            try:
-                ts_float = float(ts)
-            except (ValueError, TypeError):
-                try:
-                    from datetime import datetime
-                    ts_float = datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
-                except:
-                    continue
-            if ts_float > cutoff:
-                recent.append(t)
-
-        for t in recent:
-            if t.get("pm_slug", "").endswith(pm_trade.teams[0]) and \
-               t.get("pm_slug", "").endswith(pm_trade.teams[1]):
+        # Log is append-only, so walk newest-first and stop at the first old entry
+        for t in reversed(trades):
+            ts_float = _log_timestamp(t.get("timestamp"))
+            if ts_float is None:
+                continue
+            if ts_float <= cutoff:
+                break
+            slug = t.get("pm_slug", "")
+            if slug.endswith(pm_trade.teams[0]) and slug.endswith(pm_trade.teams[1]):
                 return True
 
         return False
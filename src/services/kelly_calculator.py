@@ -9,7 +9,7 @@ Implements fractional Kelly Criterion for smart position sizing based on:
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 
 @dataclass
@@ -137,6 +137,34 @@ class KellyCalculator:
             warnings=warnings
         )
     
+    def calculate_kelly_batch(
+        self,
+        win_rates: Sequence[float],
+        win_loss_ratios: Sequence[float],
+        current_trader_exposure: float = 0.0
+    ) -> list[float]:
+        """
+        Recommended position sizes (USDC) for many (win_rate, ratio) pairs.
+
+        Same sizing as calculate_kelly, but without building warnings or
+        KellyResult objects - for scoring a batch of whale trades.
+        """
+        kf = self.kelly_fraction
+        cap = min(self.max_trade_percent, self.max_trader_exposure - current_trader_exposure)
+        bankroll = self.bankroll
+
+        sizes = []
+        for w, r in zip(win_rates, win_loss_ratios):
+            if w < 0 or w > 1:
+                w = 0.6
+            if r <= 0:
+                r = 1.5
+            pct = (w - (1 - w) / r) * kf * 100
+            if pct > cap:
+                pct = cap
+            sizes.append(round((pct / 100) * bankroll, 2) if pct > 0 else 0.0)
+        return sizes
+
     def calculate_for_polymarket(
         self,
         trader_pnl: float,
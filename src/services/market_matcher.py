@@ -7,7 +7,7 @@ Critical module: Finds equivalent Kalshi markets for PM trades.
 import re
 from typing import Optional, Tuple, Dict, List, Any
 from dataclasses import dataclass
-from src.services.team_mappings import is_same_team, get_canonical
+from src.services.team_mappings import is_same_team, get_canonical, get_canonical_id
 
 
 @dataclass
@@ -124,9 +124,16 @@ class MarketMatcher:
         """Build searchable index of Kalshi markets."""
         self._by_sport: Dict[str, Dict[str, List[Dict]]] = {}
         self._by_game_key: Dict[str, List[Dict]] = {}
+        # (sport, id, id) -> markets: same game whatever alias either venue spelled it with
+        self._by_team_ids: Dict[Tuple[str, int, int], List[Dict]] = {}
 
         for tagged_key, markets in self.kalshi_markets.items():
             sport, market_type, game_key = self._parse_tagged_key(tagged_key)
+            ks_teams = game_key.split('-')
+            if len(ks_teams) == 2:
+                ids_key = self._team_ids_key(ks_teams[0], ks_teams[1], sport)
+                if ids_key is not None:
+                    self._by_team_ids.setdefault(ids_key, []).extend(markets)
 
             if sport not in self._by_sport:
                 self._by_sport[sport] = {}
@@ -455,8 +462,8 @@ class MarketMatcher:
 
     def _get_team_aliases(self, sport: str) -> dict:
         """Get team aliases for sport."""
-        from src.services.team_mappings import TEAM_ALIASES
-        return TEAM_ALIASES
+        from src.services.team_mappings import get_team_aliases
+        return get_team_aliases(sport)
 
     def _detect_market_type(self, title: str) -> str:
         """Detect market type from title."""
@@ -521,7 +528,7 @@ class MarketMatcher:
         team1, team2 = pm_trade.teams
 
         # Build game key
-        game_key = self._build_game_key(team1, team2)
+        game_key = self._build_game_key(team1, team2, sport)
 
         # Get Kalshi markets for this sport
         if sport not in self._by_sport:
@@ -540,17 +547,31 @@ class MarketMatcher:
             if match:
                 return match
 
+        # Same teams under other aliases ("uconn" vs "connecticut"): an int-id
+        # lookup, still an exact identity match rather than a fuzzy one
+        ids_key = self._team_ids_key(team1, team2, sport)
+        if ids_key is not None and ids_key in self._by_team_ids:
+            match = self._find_best_match(
+                self._by_team_ids[ids_key],
+                pm_trade,
+                confidence=1.0,
+                match_type='exact'
+            )
+            if match:
+                return match
+
         # DISABLED: Fuzzy matching causing false positives with unrelated games
         # Only use exact game keys for now
         return None
 
-    def _build_game_key(self, team1: str, team2: str) -> str:
+    def _build_game_key(self, team1: str, team2: str, sport: Optional[str] = None) -> str:
         """Build normalized game key from teams using canonical codes."""
         from src.services.team_mappings import get_canonical
         
-        # Get canonical codes (3-letter), not full names
-        t1 = get_canonical(team1.lower().strip())
-        t2 = get_canonical(team2.lower().strip())
+        # Get canonical codes (3-letter), not full names. Codes repeat across
+        # leagues, so resolve within the sport when we know it.
+        t1 = get_canonical(team1.lower().strip(), sport)
+        t2 = get_canonical(team2.lower().strip(), sport)
         
         # If canonical returns full name (contains space), use original code
         if t1 and ' ' in t1:
@@ -565,7 +586,17 @@ class MarketMatcher:
         
         return '-'.join(sorted([t1, t2]))
 
-    def _teams_match(self, pm_team1: str, pm_team2: str, ks_game_key: str) -> bool:
+    @staticmethod
+    def _team_ids_key(team1: str, team2: str, sport: str) -> Optional[Tuple[str, int, int]]:
+        """Order-free (sport, id, id) key, or None unless both teams resolve in sport."""
+        id1 = get_canonical_id(team1, sport)
+        id2 = get_canonical_id(team2, sport)
+        if id1 is None or id2 is None or id1 == id2:
+            return None
+        return (sport, id1, id2) if id1 < id2 else (sport, id2, id1)
+
+    def _teams_match(self, pm_team1: str, pm_team2: str, ks_game_key: str,
+                     sport: Optional[str] = None) -> bool:
         """Check if PM teams match Kalshi game key."""
         ks_teams = ks_game_key.split('-')
         if len(ks_teams) != 2:
@@ -576,7 +607,7 @@ class MarketMatcher:
         # Check if both PM teams match the KS teams (order doesn't matter)
         pm_matches = 0
         for pm_t in [pm_team1, pm_team2]:
-            if is_same_team(pm_t, ks_team1) or is_same_team(pm_t, ks_team2):
+            if is_same_team(pm_t, ks_team1, sport) or is_same_team(pm_t, ks_team2, sport):
                 pm_matches += 1
 
         return pm_matches >= 2
@@ -605,7 +636,7 @@ class MarketMatcher:
             if pm_trade.market_type == 'spread' and len(pm_trade.teams) >= 1:
                 bet_team = pm_trade.teams[0].lower()
                 # Use _team_mentioned_in_title to check ALL aliases
-                if not self._team_mentioned_in_title(bet_team, ks_title):
+                if not self._team_mentioned_in_title(bet_team, ks_title, pm_trade.sport):
                     continue
 
             # For spreads/totals, match line number (allow 1.0 point tolerance)
@@ -642,7 +673,7 @@ class MarketMatcher:
                     kalshi_market_title=ks_title,
                     kalshi_side=ks_side,
                     sport=pm_trade.sport,
-                    game_key=self._build_game_key(pm_trade.teams[0], pm_trade.teams[1]),
+                    game_key=self._build_game_key(pm_trade.teams[0], pm_trade.teams[1], pm_trade.sport),
                     confidence=min(match_confidence, 1.0),
                     match_type=match_type
                 )
@@ -668,7 +699,7 @@ class MarketMatcher:
         # Check which team is mentioned in the Kalshi market title
         ks_team = None
         for team in [team1, team2]:
-            if self._team_mentioned_in_title(team, ks_title):
+            if self._team_mentioned_in_title(team, ks_title, pm_trade.sport):
                 ks_team = team
                 break
 
@@ -678,9 +709,9 @@ class MarketMatcher:
         # For winner/spread: match the side whale took
         return pm_trade.side
 
-    def _team_mentioned_in_title(self, team: str, title: str) -> bool:
+    def _team_mentioned_in_title(self, team: str, title: str, sport: Optional[str] = None) -> bool:
         """Check if team is mentioned in market title - check ALL aliases."""
-        from src.services.team_mappings import TEAM_ALIASES
+        team_aliases = self._get_team_aliases(sport)
 
         team_lower = team.lower()
         title_lower = title.lower()
@@ -688,16 +719,16 @@ class MarketMatcher:
         if team_lower in title_lower:
             return True
 
-        canonical = get_canonical(team)
+        canonical = get_canonical(team, sport)
         if canonical and canonical.lower() in title_lower:
             return True
 
-        if canonical and canonical in TEAM_ALIASES:
-            for alias in TEAM_ALIASES[canonical]:
+        if canonical and canonical in team_aliases:
+            for alias in team_aliases[canonical]:
                 if alias.lower() in title_lower:
                     return True
 
-        for canonical_name, aliases in TEAM_ALIASES.items():
+        for canonical_name, aliases in team_aliases.items():
             for alias in aliases:
                 if alias.lower() == team_lower:
                     for a2 in aliases:
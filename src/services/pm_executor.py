@@ -6,24 +6,80 @@ Uses Builder API for gasless trading
 """
 
 import asyncio
+import logging
 import os
-import json
+import queue
+import sys
 import time
 import hmac
 import hashlib
 import base64
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional, Dict, Any
 from datetime import datetime
 from dotenv import load_dotenv
-import httpx
-from web3 import Web3
-from eth_account import Account
+import aiohttp
+import orjson
+import coincurve
+from eth_utils import keccak
+
+from src.services.eip712 import EXCHANGE_DOMAIN, sign_digest, typed_data_digest
 
 load_dotenv()
 
+log = logging.getLogger("pm_copy")
+
+# Copy-trade telemetry, one JSON object per line
+TELEMETRY_LOG = os.getenv("PM_TELEMETRY_LOG", "data/trades/pm_copies.ndjson")
+TELEMETRY_FLUSH_INTERVAL = 0.1
+
+# Last (timestamp string, wall time) pair - signatures only need second resolution
+_ts_cache = ["0", 0.0]
+
+
+def _current_timestamp() -> str:
+    """Get a unix timestamp string, refreshed at most every 250ms."""
+    now = time.time()
+    if now - _ts_cache[1] > 0.25:
+        _ts_cache[0] = str(int(now))
+        _ts_cache[1] = now
+    return _ts_cache[0]
+
+
+def use_fast_event_loop() -> bool:
+    """Run asyncio on uvloop when it's installed; call before asyncio.run.
+    
+    uvloop is optional - without it the default event loop is kept.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
 
-@dataclass
+
+def start_log_listener(level: int = logging.INFO) -> QueueListener:
+    """Send pm_copy logs through a queue drained by a background thread.
+    
+    Call once at bot startup; the event loop then only enqueues records
+    and never blocks on stdout. Stop the returned listener on shutdown.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    
+    log.handlers[:] = [QueueHandler(log_queue)]
+    log.setLevel(level)
+    log.propagate = False
+    listener.start()
+    return listener
+
+
+@dataclass(slots=True)
 class PMCopyConfig:
     """Config for PM copy trading."""
     enabled: bool = False
@@ -35,6 +91,11 @@ class PMCopyConfig:
     max_position_size: float = 50.0
     max_total_exposure: float = 300.0
     dry_run: bool = True
+    _creds_valid: bool = field(init=False, repr=False, default=False)
+    
+    def __post_init__(self):
+        # Checked once here instead of rebuilding a list in every executor
+        self._creds_valid = bool(self.wallet_address and self.builder_api_key and self.builder_secret)
     
     @classmethod
     def from_env(cls) -> "PMCopyConfig":
@@ -52,6 +113,32 @@ class PMCopyConfig:
         )
 
 
+@dataclass(slots=True)
+class CopyTradeInput:
+    """Whale trade fields parsed once from the activity API payload."""
+    token_id: str
+    side: str
+    outcome: str
+    size: float
+    trader: str
+    title: str
+    slug: str
+    
+    @classmethod
+    def from_wire(cls, d: dict) -> "CopyTradeInput":
+        """Parse the flat activity dict, coalescing alternate field names."""
+        trader_address = d.get("_trader_address")
+        return cls(
+            token_id=d.get("asset") or d.get("conditionId") or "",
+            side=d.get("side", "buy").lower(),
+            outcome=d.get("outcome", d.get("name", "yes")),
+            size=float(d.get("usdcSize") or d.get("size", 0)),
+            trader=trader_address[:10] if trader_address else "unknown",
+            title=d.get("title", "Unknown"),
+            slug=d.get("slug", ""),
+        )
+
+
 class PMClient:
     """Polymarket CLOB client with Builder authentication."""
     
@@ -59,21 +146,77 @@ class PMClient:
     
     def __init__(self, config: PMCopyConfig):
         self.config = config
-        self.session = httpx.AsyncClient(timeout=30.0)
+        # aiohttp session is created lazily so it binds to the running loop
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Bulkheads: order bursts must not starve balance/market reads
+        self._order_sem = asyncio.Semaphore(8)
+        self._read_sem = asyncio.Semaphore(16)
+        
+        # Market list changes on the order of minutes; keep (fetched_at, data)
+        self._markets_cache: Optional[tuple] = None
+        self._markets_ttl = 60.0
+        
+        # Domain separator is constant per (chainId, verifyingContract)
+        self._domain_hash = EXCHANGE_DOMAIN
+        
+        # Builder secret never changes: derive the HMAC key pads once, .copy() per request
+        self._hmac_proto = hmac.new(config.builder_secret.encode(), digestmod=hashlib.sha256)
+        
+        # (method, path) -> (timestamp, headers) for body-less polls; signatures repeat within a second
+        self._hdr_cache: Dict[tuple, tuple] = {}
+        
+        # Per-client order fields; place_order copies this and fills in the rest
+        self._order_tpl = {
+            "maker": config.wallet_address.lower(),
+            "taker": "0x0000000000000000000000000000000000000000"
+        }
+        
+        # Decoded once, on first signing - a bad key must not break dry runs
+        self._signer: Optional[coincurve.PrivateKey] = None
+        
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled CLOB session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
         
-    def _get_headers(self, method: str, path: str, body: str = "") -> Dict[str, str]:
+    def _get_signer(self) -> coincurve.PrivateKey:
+        """Return the order signer, decoding PRIVATE_KEY on first use."""
+        if self._signer is None:
+            pk = self.config.private_key
+            if not pk:
+                raise ValueError("PRIVATE_KEY is not set - cannot sign PM orders")
+            try:
+                self._signer = coincurve.PrivateKey(bytes.fromhex(pk[2:] if pk.startswith("0x") else pk))
+            except ValueError as e:
+                raise ValueError(f"PRIVATE_KEY is malformed - cannot sign PM orders: {e}") from None
+        return self._signer
+        
+    def _get_headers(self, method: str, path: str, body: bytes = b"") -> Dict[str, str]:
         """Generate Builder authentication headers."""
-        timestamp = str(int(time.time()))
-        message = timestamp + method.upper() + path + body
+        timestamp = _current_timestamp()
+        key = (method, path)
+        if not body:
+            cached = self._hdr_cache.get(key)
+            if cached and cached[0] == timestamp:
+                return cached[1]
         
         # Create signature using Builder secret
-        signature = hmac.new(
-            self.config.builder_secret.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        h = self._hmac_proto.copy()
+        h.update((timestamp + method.upper() + path).encode())
+        h.update(body)
+        signature = h.hexdigest()
         
-        return {
+        headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             "POLY-API-KEY": self.config.builder_api_key,
@@ -81,54 +224,87 @@ class PMClient:
             "POLY-TIMESTAMP": timestamp,
             "POLY-PASSPHRASE": self.config.builder_passphrase
         }
+        if not body:
+            # Order bodies are unique per call, so only polls are worth caching
+            if len(self._hdr_cache) >= 64:
+                self._hdr_cache.clear()
+            self._hdr_cache[key] = (timestamp, headers)
+        return headers
     
     async def get_markets(self) -> list:
-        """Get available markets."""
-        try:
-            headers = self._get_headers("GET", "/markets")
-            resp = await self.session.get(
-                f"{self.CLOB_URL}/markets",
-                headers=headers
-            )
-            if resp.status_code == 200:
-                return resp.json().get("data", [])
-        except Exception as e:
-            print(f"Error getting markets: {e}")
-        return []
+        """Get available markets (cached for ``_markets_ttl`` seconds)."""
+        now = time.monotonic()
+        if self._markets_cache and now - self._markets_cache[0] < self._markets_ttl:
+            return self._markets_cache[1]
+        
+        async with self._read_sem:
+            try:
+                headers = self._get_headers("GET", "/markets")
+                async with self._get_session().get(
+                    f"{self.CLOB_URL}/markets",
+                    headers=headers
+                ) as resp:
+                    if resp.status == 200:
+                        markets = orjson.loads(await resp.read()).get("data", [])
+                        self._markets_cache = (time.monotonic(), markets)
+                        return markets
+            except Exception as e:
+                log.error(f"Error getting markets: {e}")
+            
+            # Degrade gracefully: stale markets beat no markets
+            if self._markets_cache:
+                age = now - self._markets_cache[0]
+                log.warning(f"⚠️  Serving stale markets ({age:.0f}s old)")
+                return self._markets_cache[1]
+            return []
     
     async def get_balance(self) -> float:
         """Get USDC balance."""
-        try:
-            path = f"/balance/{self.config.wallet_address}"
-            headers = self._get_headers("GET", path)
-            resp = await self.session.get(
-                f"{self.CLOB_URL}{path}",
-                headers=headers
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                return float(data.get("balance", 0))
-        except Exception as e:
-            print(f"Error getting balance: {e}")
-        return 0.0
+        async with self._read_sem:
+            try:
+                path = f"/balance/{self.config.wallet_address}"
+                headers = self._get_headers("GET", path)
+                async with self._get_session().get(
+                    f"{self.CLOB_URL}{path}",
+                    headers=headers
+                ) as resp:
+                    if resp.status == 200:
+                        data = orjson.loads(await resp.read())
+                        return float(data.get("balance", 0))
+            except Exception as e:
+                log.error(f"Error getting balance: {e}")
+            return 0.0
+    
+    async def get_price(self, token_id: str, side: str = "buy") -> Optional[float]:
+        """Get best executable price from the order book (ask for buys, bid for sells)."""
+        async with self._read_sem:
+            try:
+                async with self._get_session().get(
+                    f"{self.CLOB_URL}/book",
+                    params={"token_id": token_id}
+                ) as resp:
+                    if resp.status == 200:
+                        book = orjson.loads(await resp.read())
+                        if side == "buy":
+                            levels = [float(a["price"]) for a in book.get("asks", [])]
+                            return min(levels) if levels else None
+                        levels = [float(b["price"]) for b in book.get("bids", [])]
+                        return max(levels) if levels else None
+            except Exception as e:
+                log.error(f"Error getting price: {e}")
+            return None
     
     def _sign_order_eip712(self, order_data: dict) -> str:
         """Sign order using EIP-712 for PM CLOB."""
-        from eth_account import Account
-        from eth_account.messages import encode_defunct
+        signer = self._get_signer()
         
         # Create order hash
-        order_str = json.dumps(order_data, sort_keys=True)
-        order_hash = Web3.keccak(text=order_str)
-        
-        # Create signable message
-        signable_msg = encode_defunct(primitive=order_hash)
-        
-        # Sign with private key
-        account = Account.from_key(self.config.private_key)
-        signed = account.sign_message(signable_msg)
+        order_bytes = orjson.dumps(order_data, option=orjson.OPT_SORT_KEYS)
+        struct_hash = keccak(order_bytes)
         
-        return signed.signature.hex()
+        # EIP-712 digest with the cached domain separator, signed with libsecp256k1
+        digest = typed_data_digest(struct_hash, self._domain_hash)
+        return sign_digest(signer, digest)
     
     async def place_order(
         self, 
@@ -138,60 +314,59 @@ class PMClient:
         price: float
     ) -> Dict[str, Any]:
         """Place an order on PM CLOB with Builder auth."""
-        import time
-        
-        try:
-            # Get current timestamp
-            timestamp = str(int(time.time()))
-            
-            # Create order payload
-            order_data = {
-                "tokenId": token_id,
-                "side": side.lower(),
-                "size": str(size),
-                "price": str(price),
-                "timestamp": timestamp,
-                "maker": self.config.wallet_address.lower(),
-                "taker": "0x0000000000000000000000000000000000000000"
-            }
+        async with self._order_sem:
+            try:
+                # Get current timestamp
+                timestamp = _current_timestamp()
             
-            # Sign the order
-            signature = self._sign_order_eip712(order_data)
-            order_data["signature"] = signature
+                # Create order payload (copy: orders may be in flight concurrently)
+                order_data = self._order_tpl.copy()
+                order_data["tokenId"] = token_id
+                order_data["side"] = side.lower()
+                order_data["size"] = str(size)
+                order_data["price"] = str(price)
+                order_data["timestamp"] = timestamp
             
-            # Submit to CLOB
-            body = json.dumps(order_data)
-            headers = self._get_headers("POST", "/order", body)
+                # Sign the order
+                signature = self._sign_order_eip712(order_data)
+                order_data["signature"] = signature
             
-            resp = await self.session.post(
-                f"{self.CLOB_URL}/order",
-                json=order_data,
-                headers=headers
-            )
+                # Submit to CLOB
+                # Serialize once: the signed HMAC body is exactly what gets sent
+                body = orjson.dumps(order_data)
+                headers = self._get_headers("POST", "/order", body)
             
-            if resp.status_code == 200:
-                return {
-                    "success": True,
-                    "order_id": resp.json().get("orderId", "unknown"),
-                    "status": "SUBMITTED",
-                    "response": resp.json()
-                }
-            else:
+                async with self._get_session().post(
+                    f"{self.CLOB_URL}/order",
+                    data=body,
+                    headers=headers
+                ) as resp:
+                    raw = await resp.read()
+                    if resp.status == 200:
+                        data = orjson.loads(raw)
+                        return {
+                            "success": True,
+                            "order_id": data.get("orderId", "unknown"),
+                            "status": "SUBMITTED",
+                            "response": data
+                        }
+                    else:
+                        return {
+                            "success": False,
+                            "error": f"HTTP {resp.status}: {raw.decode(errors='replace')}",
+                            "status": "FAILED"
+                        }
+                
+            except Exception as e:
                 return {
                     "success": False,
-                    "error": f"HTTP {resp.status_code}: {resp.text}",
-                    "status": "FAILED"
+                    "error": str(e),
+                    "status": "ERROR"
                 }
-                
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "status": "ERROR"
-            }
     
     async def close(self):
-        await self.session.aclose()
+        if self.session and not self.session.closed:
+            await self.session.close()
 
 
 class PolymarketCopyExecutor:
@@ -200,23 +375,28 @@ class PolymarketCopyExecutor:
     def __init__(self, config: PMCopyConfig):
         self.config = config
         self.client = PMClient(config) if config.enabled else None
-        self.positions = {}
+        self.positions: Dict[str, float] = defaultdict(float)
         self.total_exposure = 0.0
+        self._wallet_short = (config.wallet_address[:10] + "...") if config.wallet_address else None
+        
+        # Telemetry is queued here and written in batches by _drain_events
+        self._events: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._writer_task: Optional[asyncio.Task] = None
         
         if not config.enabled:
-            print("⚠️  PM Copy Trading disabled")
+            log.warning("⚠️  PM Copy Trading disabled")
             return
             
-        if not all([config.wallet_address, config.builder_api_key, config.builder_secret]):
-            print("❌ Missing PM credentials!")
+        if not config._creds_valid:
+            log.error("❌ Missing PM credentials!")
             self.config.enabled = False
             return
             
-        print("✓ PM Copy Executor initialized")
-        print(f"  Wallet: {config.wallet_address[:10]}...")
-        print(f"  Mode: {'DRY RUN' if config.dry_run else 'LIVE'}")
-        print(f"  Max per trade: ${config.max_position_size}")
-        print(f"  Copies ALL markets (no sports filter)")
+        log.info("✓ PM Copy Executor initialized")
+        log.info(f"  Wallet: {self._wallet_short}")
+        log.info(f"  Mode: {'DRY RUN' if config.dry_run else 'LIVE'}")
+        log.info(f"  Max per trade: ${config.max_position_size}")
+        log.info("  Copies ALL markets (no sports filter)")
         
     async def execute_copy_trade(self, trade_data: dict) -> Dict[str, Any]:
         """Execute a copy trade on PM - NO sports filter!"""
@@ -224,23 +404,23 @@ class PolymarketCopyExecutor:
         if not self.config.enabled or not self.client:
             return {"success": False, "error": "PM trading disabled"}
             
-        # Extract trade info - API returns flat structure
-        title = trade_data.get("title", "Unknown")
-        slug = trade_data.get("slug", "")
-        outcome = trade_data.get("outcome", trade_data.get("name", "yes"))
-        side = trade_data.get("side", "buy").lower()
-        whale_size = float(trade_data.get("usdcSize") or trade_data.get("size", 0))
-        
-        # Get token ID from conditionId or asset
-        token_id = trade_data.get("asset") or trade_data.get("conditionId") or ""
+        # Parse the flat API payload once
+        trade = CopyTradeInput.from_wire(trade_data)
+        title = trade.title
+        outcome = trade.outcome
+        side = trade.side
+        whale_size = trade.size
+        token_id = trade.token_id
+        trader = trade.trader
         
-        # Get trader attribution
-        trader = trade_data.get("_trader_address", "unknown")[:10]
+        # Start the book lookup now so it overlaps with sizing/limit checks
+        price_task = None
+        if not self.config.dry_run and token_id:
+            price_task = asyncio.create_task(self.client.get_price(token_id, side))
         
-        print(f"\n🎯 PM Copy Trade from {trader}:")
-        print(f"   Market: {title[:50]}...")
-        print(f"   Whale: ${whale_size:.2f}")
-        print(f"   Side: {side} {outcome}")
+        log.info("\n🎯 PM Copy Trade from %s: %s %s $%.2f | %.50s", trader, side, outcome, whale_size, title)
+        self._emit("copy_trade", trader=trader, title=title, slug=trade.slug, token_id=token_id,
+                   side=side, outcome=outcome, whale_size=whale_size)
         
         # Calculate position size using relative sizing like Kalshi
         # our_size = whale_size * relative_factor, capped at limits
@@ -252,22 +432,32 @@ class PolymarketCopyExecutor:
         our_size = max(our_size, 0.50)  # Minimum $0.50 to avoid dust
         
         if our_size < 1.0:
-            print(f"   ⚠️  Too small (${our_size:.2f}), skipping")
+            log.warning("   ⚠️  Too small ($%.2f), skipping", our_size)
+            self._emit("skipped", token_id=token_id, reason="size_too_small", size=our_size)
+            if price_task:
+                price_task.cancel()
             return {"success": False, "error": "Size too small"}
             
         # Check per-market position limit (like Kalshi's $27 per market side)
         current_position = self.positions.get(token_id, 0)
         if current_position + our_size > self.config.max_position_size * 2:  # Allow up to 2x max per market
-            print(f"   ⚠️  Max position for this market reached (${current_position:.2f})")
+            log.warning("   ⚠️  Max position for this market reached ($%.2f)", current_position)
+            self._emit("skipped", token_id=token_id, reason="max_market_position", size=our_size)
+            if price_task:
+                price_task.cancel()
             return {"success": False, "error": "Max market position"}
         
         # Check total exposure limit
         if self.total_exposure + our_size > self.config.max_total_exposure:
-            print(f"   ⚠️  Max total exposure reached (${self.total_exposure:.2f})")
+            log.warning("   ⚠️  Max total exposure reached ($%.2f)", self.total_exposure)
+            self._emit("skipped", token_id=token_id, reason="max_exposure", size=our_size)
+            if price_task:
+                price_task.cancel()
             return {"success": False, "error": "Max exposure"}
         
         if self.config.dry_run:
-            print(f"   🧪 DRY RUN - Would buy ${our_size:.2f} of {outcome}")
+            log.info("   🧪 DRY RUN - Would buy $%.2f of %s", our_size, outcome)
+            self._emit("dry_run", token_id=token_id, side=side, outcome=outcome, size=our_size)
             return {
                 "success": True,
                 "dry_run": True,
@@ -278,10 +468,10 @@ class PolymarketCopyExecutor:
             }
         
         # Place actual order
-        print(f"   📤 Placing order: ${our_size:.2f} {outcome}")
+        log.info("   📤 Placing order: $%.2f %s", our_size, outcome)
         
-        # Get market price (would need token_id mapping)
-        price = 0.50  # Default to 50% for now
+        # Best book price, falling back to 50% if the book is empty/unavailable
+        price = (await price_task if price_task else None) or 0.50
         
         result = await self.client.place_order(
             token_id=token_id,
@@ -292,12 +482,61 @@ class PolymarketCopyExecutor:
         
         if result.get("success"):
             self.total_exposure += our_size
-            self.positions[token_id] = self.positions.get(token_id, 0) + our_size
-            print(f"   ✅ Order placed: {result.get('order_id')}")
+            self.positions[token_id] += our_size
+            log.info("   ✅ Order placed: %s", result.get("order_id"))
         else:
-            print(f"   ❌ Failed: {result.get('error')}")
+            log.warning("   ❌ Failed: %s", result.get("error"))
+        self._emit("order", token_id=token_id, side=side, size=our_size, price=price,
+                   success=bool(result.get("success")), order_id=result.get("order_id"),
+                   error=result.get("error"))
         
         return result
+    
+    def _emit(self, event: str, **fields):
+        """Queue a telemetry event; the writer task is started on first use."""
+        if self._writer_task is None:
+            try:
+                self._writer_task = asyncio.get_running_loop().create_task(self._drain_events())
+            except RuntimeError:
+                return  # No loop running (sync caller) - nothing can drain the queue
+            os.makedirs(os.path.dirname(TELEMETRY_LOG) or ".", exist_ok=True)
+        fields["ts"] = time.time()
+        fields["event"] = event
+        try:
+            self._events.put_nowait(fields)
+        except asyncio.QueueFull:
+            pass  # Telemetry must never block trading
+    
+    async def _drain_events(self):
+        """Batch queued events every 100ms into one NDJSON append."""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._events.get()]
+                deadline = loop.time() + TELEMETRY_FLUSH_INTERVAL
+                while (remaining := deadline - loop.time()) > 0:
+                    try:
+                        batch.append(await asyncio.wait_for(self._events.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                # Hand the batch off before awaiting: if close() cancels us mid-write
+                # the worker thread still finishes it, so the handler mustn't redo it
+                pending, batch = batch, []
+                await asyncio.to_thread(self._write_events, pending)
+        except asyncio.CancelledError:
+            # Flush the batch still being collected plus anything queued
+            while not self._events.empty():
+                batch.append(self._events.get_nowait())
+            if batch:
+                self._write_events(batch)
+            raise
+    
+    @staticmethod
+    def _write_events(batch: list):
+        data = b"\n".join(orjson.dumps(e) for e in batch) + b"\n"
+        with open(TELEMETRY_LOG, "ab") as f:
+            f.write(data)
         
     async def get_balance(self) -> float:
         """Get current USDC balance."""
@@ -312,10 +551,23 @@ class PolymarketCopyExecutor:
             "dry_run": self.config.dry_run,
             "total_exposure": self.total_exposure,
             "positions": len(self.positions),
-            "wallet": self.config.wallet_address[:10] + "..." if self.config.wallet_address else None
+            "wallet": self._wallet_short
         }
     
     async def close(self):
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            # A writer cancelled before its first run leaves events queued
+            pending = []
+            while not self._events.empty():
+                pending.append(self._events.get_nowait())
+            if pending:
+                self._write_events(pending)
         if self.client:
             await self.client.close()
 
@@ -369,4 +621,8 @@ async def test_pm_executor():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_pm_executor())
+    listener = start_log_listener()
+    try:
+        asyncio.run(test_pm_executor())
+    finally:
+        listener.stop()
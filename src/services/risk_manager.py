@@ -9,30 +9,54 @@ Enforces position limits, drawdown protection, and exposure management:
 - Automatic stop-loss triggers
 """
 
+import sys
 from dataclasses import dataclass
-from enum import Enum
-from typing import Optional
+from enum import IntEnum
+from typing import Optional, Sequence
 
 
-class RiskLevel(Enum):
-    """Risk level classification."""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+class RiskLevel(IntEnum):
+    """Risk level classification, ordered so levels compare with max()."""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name, e.g. "high"."""
+        return self.name.lower()
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskCheckResult:
     """Result of a risk check."""
     approved: bool
     risk_level: RiskLevel
     position_size: float
-    warnings: list[str]
+    warnings: tuple[str, ...]
     final_position_size: float
     suggested_multiplier: float
 
 
+# Shared by every result that has no warnings (the common case)
+_EMPTY_WARNINGS: tuple[str, ...] = ()
+
+
+def _with_warning(warnings: Sequence[str], message: str) -> list[str]:
+    """Append a warning, allocating the list only on the first one."""
+    if warnings is _EMPTY_WARNINGS:
+        return [message]
+    warnings.append(message)
+    return warnings
+
+
+def _wallet_key(wallet: str) -> str:
+    """Canonical exposure-map key: lowercased and interned, so mixed-case
+    addresses for the same wallet share one bucket."""
+    return sys.intern(wallet.lower())
+
+
 class RiskManager:
     """Manages risk for copy trading operations."""
     
@@ -64,10 +88,20 @@ class RiskManager:
         self.bankroll = bankroll
         
         # Track current state
-        self.trader_exposures: dict[str, float] = {}  # wallet -> % exposure
+        self.trader_exposures: dict[str, float] = {}  # lowercased wallet -> % exposure
         self.current_drawdown: float = 0.0
         self.peak_bankroll: float = bankroll
         self.current_exposure_percent: float = 0.0
+        
+        self._recompute_cached()
+    
+    def _recompute_cached(self):
+        """Precompute bankroll-derived sizes; call whenever bankroll changes."""
+        self._bankroll_inv_pct = 100.0 / self.bankroll  # USDC -> % of bankroll
+        self._pct_to_usd = self.bankroll / 100.0        # % of bankroll -> USDC
+        self._max_trade_size = self.max_trade_percent * self._pct_to_usd
+        self._max_trader_size = self.max_trader_exposure * self._pct_to_usd
+        self._max_total_size = self.max_total_exposure * self._pct_to_usd
     
     def check_position(
         self,
@@ -88,24 +122,25 @@ class RiskManager:
         Returns:
             RiskCheckResult with approval and modifications
         """
-        warnings = []
-        max_size = (self.max_trade_percent / 100) * self.bankroll
+        warnings: Sequence[str] = _EMPTY_WARNINGS
+        max_size = self._max_trade_size
         
         # Check 1: Max per trade
         if proposed_size > max_size:
-            warnings.append(
+            warnings = _with_warning(
+                warnings,
                 f"Proposed ${proposed_size:.2f} exceeds max ${max_size:.2f} per trade"
             )
             proposed_size = max_size
         
         # Check 2: Per-trader exposure
-        current_exposure = self.trader_exposures.get(trader_wallet, 0.0)
-        potential_exposure = current_exposure + (proposed_size / self.bankroll * 100)
+        current_exposure = self.trader_exposures.get(_wallet_key(trader_wallet), 0.0)
+        potential_exposure = current_exposure + proposed_size * self._bankroll_inv_pct
         
         if potential_exposure > self.max_trader_exposure:
-            available = self.max_trader_exposure - current_exposure
-            available_size = (available / 100) * self.bankroll
-            warnings.append(
+            available_size = self._max_trader_size - current_exposure * self._pct_to_usd
+            warnings = _with_warning(
+                warnings,
                 f"Would exceed max {self.max_trader_exposure}% per trader, "
                 f"reducing to ${available_size:.2f}"
             )
@@ -113,11 +148,11 @@ class RiskManager:
             potential_exposure = self.max_trader_exposure
         
         # Check 3: Total exposure
-        total_exposure = self.current_exposure_percent + (proposed_size / self.bankroll * 100)
+        total_exposure = self.current_exposure_percent + proposed_size * self._bankroll_inv_pct
         if total_exposure > self.max_total_exposure:
-            available = self.max_total_exposure - self.current_exposure_percent
-            available_size = (available / 100) * self.bankroll
-            warnings.append(
+            available_size = self._max_total_size - self.current_exposure_percent * self._pct_to_usd
+            warnings = _with_warning(
+                warnings,
                 f"Would exceed max {self.max_total_exposure}% total exposure, "
                 f"reducing to ${available_size:.2f}"
             )
@@ -131,16 +166,17 @@ class RiskManager:
                 reduction = 1.0 - (self.drawdown_reduction_factor * drawdown_ratio)
                 original_size = proposed_size
                 proposed_size = proposed_size * reduction
-                warnings.append(
+                warnings = _with_warning(
+                    warnings,
                     f"Drawdown {self.current_drawdown:.1f}% - reducing position by {(1-reduction)*100:.0f}%"
                 )
                 if proposed_size < 1.0:
-                    warnings.append("Position too small after reduction - skipping trade")
+                    warnings = _with_warning(warnings, "Position too small after reduction - skipping trade")
                     return RiskCheckResult(
                         approved=False,
                         risk_level=RiskLevel.CRITICAL,
                         position_size=0.0,
-                        warnings=warnings,
+                        warnings=tuple(warnings),
                         final_position_size=0.0,
                         suggested_multiplier=0.0
                     )
@@ -157,7 +193,7 @@ class RiskManager:
             approved=True,
             risk_level=risk_level,
             position_size=proposed_size,
-            warnings=warnings,
+            warnings=tuple(warnings),
             final_position_size=proposed_size,
             suggested_multiplier=suggested_multiplier
         )
@@ -169,45 +205,20 @@ class RiskManager:
         pnl: float
     ) -> RiskLevel:
         """Calculate risk level for a position."""
-        size_percent = (position_size / self.bankroll) * 100
-        
-        # Size-based risk
-        if size_percent > 1.5:
-            size_risk = RiskLevel.HIGH
-        elif size_percent > 1.0:
-            size_risk = RiskLevel.MEDIUM
-        else:
-            size_risk = RiskLevel.LOW
+        size_percent = position_size * self._bankroll_inv_pct
         
-        # Win rate risk
-        if win_rate < 0.45:
-            win_risk = RiskLevel.HIGH
-        elif win_rate > 0.70:
-            win_risk = RiskLevel.MEDIUM  # Suspiciously high
-        else:
-            win_risk = RiskLevel.LOW
-        
-        # PnL risk
-        if pnl < -100:
-            pnl_risk = RiskLevel.HIGH
-        elif pnl < 0:
-            pnl_risk = RiskLevel.MEDIUM
-        else:
-            pnl_risk = RiskLevel.LOW
+        # Rank each factor (0=LOW .. 3=CRITICAL) with comparisons-as-ints
+        size_rank = (size_percent > 1.0) + (size_percent > 1.5)
+        win_rank = 2 * (win_rate < 0.45) + (win_rate > 0.70)  # >70% is suspiciously high
+        pnl_rank = (pnl < 0) + (pnl < -100)
         
         # Return highest risk
-        risks = [size_risk, win_risk, pnl_risk]
-        if RiskLevel.CRITICAL in risks:
-            return RiskLevel.CRITICAL
-        elif RiskLevel.HIGH in risks:
-            return RiskLevel.HIGH
-        elif RiskLevel.MEDIUM in risks:
-            return RiskLevel.MEDIUM
-        return RiskLevel.LOW
+        return RiskLevel(max(size_rank, win_rank, pnl_rank))
     
     def update_bankroll(self, new_bankroll: float, peak_bankroll: Optional[float] = None):
         """Update bankroll and calculate drawdown."""
         self.bankroll = new_bankroll
+        self._recompute_cached()
         
         if peak_bankroll:
             self.peak_bankroll = peak_bankroll
@@ -221,18 +232,21 @@ class RiskManager:
     
     def add_trader_exposure(self, trader_wallet: str, amount: float):
         """Add exposure for a trader."""
-        current = self.trader_exposures.get(trader_wallet, 0.0)
-        self.trader_exposures[trader_wallet] = current + (amount / self.bankroll * 100)
-        self._update_total_exposure()
+        wallet = _wallet_key(trader_wallet)
+        delta = amount * self._bankroll_inv_pct
+        self.trader_exposures[wallet] = self.trader_exposures.get(wallet, 0.0) + delta
+        self.current_exposure_percent += delta
     
     def remove_trader_exposure(self, trader_wallet: str, amount: float):
         """Remove exposure for a trader."""
-        current = self.trader_exposures.get(trader_wallet, 0.0)
-        self.trader_exposures[trader_wallet] = max(0.0, current - (amount / self.bankroll * 100))
-        self._update_total_exposure()
+        wallet = _wallet_key(trader_wallet)
+        current = self.trader_exposures.get(wallet, 0.0)
+        new = max(0.0, current - amount * self._bankroll_inv_pct)
+        self.trader_exposures[wallet] = new
+        self.current_exposure_percent += new - current
     
-    def _update_total_exposure(self):
-        """Update total exposure percentage."""
+    def recompute_total_exposure(self):
+        """Rebuild total exposure from per-trader values (after direct edits)."""
         self.current_exposure_percent = sum(self.trader_exposures.values())
     
     def get_risk_summary(self) -> dict:
@@ -242,25 +256,21 @@ class RiskManager:
             "current_drawdown": self.current_drawdown,
             "peak_bankroll": self.peak_bankroll,
             "max_trade_percent": self.max_trade_percent,
-            "max_trade_size": (self.max_trade_percent / 100) * self.bankroll,
+            "max_trade_size": self._max_trade_size,
             "max_trader_exposure": self.max_trader_exposure,
             "max_total_exposure": self.max_total_exposure,
             "current_total_exposure": self.current_exposure_percent,
             "trader_exposures": dict(self.trader_exposures),
-            "risk_level": self._get_overall_risk_level().value
+            "risk_level": self._get_overall_risk_level().label
         }
     
     def _get_overall_risk_level(self) -> RiskLevel:
         """Get overall portfolio risk level."""
-        if self.current_drawdown > self.max_drawdown_percent * 0.8:
-            return RiskLevel.CRITICAL
-        elif self.current_drawdown > self.max_drawdown_percent * 0.5:
-            return RiskLevel.HIGH
-        elif self.current_exposure_percent > self.max_total_exposure * 0.8:
-            return RiskLevel.HIGH
-        elif self.current_exposure_percent > self.max_total_exposure * 0.5:
-            return RiskLevel.MEDIUM
-        return RiskLevel.LOW
+        drawdown_rank = 2 * (self.current_drawdown > self.max_drawdown_percent * 0.5) + \
+            (self.current_drawdown > self.max_drawdown_percent * 0.8)
+        exposure_rank = (self.current_exposure_percent > self.max_total_exposure * 0.5) + \
+            (self.current_exposure_percent > self.max_total_exposure * 0.8)
+        return RiskLevel(max(drawdown_rank, exposure_rank))
     
     def reset(self):
         """Reset all risk tracking."""
@@ -292,7 +302,7 @@ if __name__ == "__main__":
     )
     print(f"Test 1: Normal $5 position")
     print(f"  Approved: {result.approved}")
-    print(f"  Risk Level: {result.risk_level.value}")
+    print(f"  Risk Level: {result.risk_level.label}")
     print(f"  Final Size: ${result.final_position_size:.2f}")
     print(f"  Multiplier: {result.suggested_multiplier:.2f}x")
     if result.warnings:
@@ -4,10 +4,32 @@ Explicit team name mappings for cross-platform market matching.
 SAFE: Only matches known aliases - never guesses.
 """
 
-from typing import Dict, Set, Tuple, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Set, Tuple, Optional
 import re
+import sys
 
-TEAM_ALIASES: Dict[str, Set[str]] = {
+_RE_NONALNUM = re.compile(r'[^a-z0-9]')
+# Deletes every ASCII char that is not [a-z0-9] (input is lowercased first)
+_STRIP_ASCII = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not ('a' <= chr(c) <= 'z' or '0' <= chr(c) <= '9')
+))
+_RE_KX = re.compile(r'^KX')
+_RE_GAME = re.compile(r'GAME-?\d*[A-Z]*')
+_RE_TEAMS = re.compile(r'([A-Z]{3})([A-Z]{3,4})$')
+
+
+@lru_cache(maxsize=2048)
+def normalize(name: str) -> str:
+    out = name.lower().translate(_STRIP_ASCII)
+    if out.isascii():
+        return out
+    # Rare non-ASCII input (accents etc.) - fall back to the regex
+    return _RE_NONALNUM.sub('', out)
+
+
+NBA_TEAMS: Dict[str, Set[str]] = {
     "uta": {"utah", "uta", "jazz"},
     "bos": {"boston", "bos", "celtics"},
     "bkn": {"brooklyn", "bkn", "nets"},
@@ -37,6 +59,9 @@ TEAM_ALIASES: Dict[str, Set[str]] = {
     "sas": {"san antonio", "sas", "spurs"},
     "tor": {"toronto", "tor", "raptors"},
     "wsh": {"washington", "wsh", "wizards"},
+}
+
+NFL_TEAMS: Dict[str, Set[str]] = {
     "arizona cardinals": {"arizona", "ari", "cardinals"},
     "atlanta falcons": {"atlanta", "atl", "falcons"},
     "baltimore ravens": {"baltimore", "bal", "ravens"},
@@ -69,8 +94,11 @@ TEAM_ALIASES: Dict[str, Set[str]] = {
     "tampa bay buccaneers": {"tampa bay", "tb", "buccaneers"},
     "tennessee titans": {"tennessee", "ten", "titans"},
     "washington commanders": {"washington", "wsh", "commanders"},
-    # NHL Teams - Kalshi uses specific 3-letter codes
-    # Canonical is Kalshi's code, aliases are what PM might use
+}
+
+# NHL Teams - Kalshi uses specific 3-letter codes
+# Canonical is Kalshi's code, aliases are what PM might use
+NHL_TEAMS: Dict[str, Set[str]] = {
     "cgy": {"calgary", "cgy", "flames", "cal"},
     "edm": {"edmonton", "edm", "oilers"},
     "van": {"vancouver", "van", "canucks"},
@@ -104,6 +132,9 @@ TEAM_ALIASES: Dict[str, Set[str]] = {
     "tbl": {"tampa bay", "tbl", "lightning"},
     "ana": {"anaheim", "ana", "ducks"},
     "ari": {"arizona", "ari", "coyotes"},
+}
+
+CBB_TEAMS: Dict[str, Set[str]] = {
     "uconn": {"uconn", "connecticut"},
     "houston": {"houston", "hou"},
     "purdue": {"purdue"},
@@ -128,49 +159,189 @@ TEAM_ALIASES: Dict[str, Set[str]] = {
     "nevada": {"nevada"},
     "utah state": {"utah state", "utahstate"},
     "san diego state": {"san diego state", "sdsu"},
-    "houston": {"houston", "hou"},
     "memphis": {"memphis"},
     "cincinnati": {"cincinnati"},
-    "connecticut": {"connecticut", "uconn"},
 }
 
+_SPORT_TEAMS: Dict[str, Dict[str, Set[str]]] = {
+    "nba": NBA_TEAMS,
+    "nfl": NFL_TEAMS,
+    "nhl": NHL_TEAMS,
+    "cbb": CBB_TEAMS,
+}
+
+# A team is identified by (sport, code): Kalshi reuses codes between leagues
+# ("bos" is both the Celtics and the Bruins), so a bare code is ambiguous.
+TeamKey = Tuple[str, str]
+
+# Flat alias view across sports, for title scans when the sport is unknown.
+# Shared codes get the union of aliases - never use it to decide identity.
+TEAM_ALIASES: Dict[str, Set[str]] = {}
+for _teams in _SPORT_TEAMS.values():
+    for canonical, aliases in _teams.items():
+        TEAM_ALIASES.setdefault(canonical, set()).update(aliases)
+
+# Lookups are keyed by normalize(alias) so multi-word aliases ("golden state")
+# match normalized input. Canonical values are interned so is_same_team's
+# equality check short-circuits on identity.
+_CANONICAL_BY_SPORT: Dict[Tuple[str, str], str] = {}
+_KEYS_FROM_ALIAS: Dict[str, FrozenSet[TeamKey]] = {}
+for _sport, _teams in _SPORT_TEAMS.items():
+    for canonical, aliases in _teams.items():
+        canonical = sys.intern(canonical)
+        for alias in aliases:
+            _key = normalize(alias)
+            _CANONICAL_BY_SPORT[(_sport, _key)] = canonical
+            _KEYS_FROM_ALIAS[_key] = _KEYS_FROM_ALIAS.get(_key, frozenset()) | {(_sport, canonical)}
+
+# Sport-less index: only aliases naming exactly one team whose code is not
+# reused by another league ("celtics" -> "bos" would collide with "bruins")
+_SHARED_CODES: FrozenSet[str] = frozenset(
+    code for code, n in Counter(c for t in _SPORT_TEAMS.values() for c in t).items() if n > 1
+)
 _CANONICAL_FROM_ALIAS: Dict[str, str] = {}
-for canonical, aliases in TEAM_ALIASES.items():
-    for alias in aliases:
-        _CANONICAL_FROM_ALIAS[alias.lower()] = canonical
+for _key, _team_keys in _KEYS_FROM_ALIAS.items():
+    if len(_team_keys) == 1:
+        (_sport, canonical), = _team_keys
+        if canonical not in _SHARED_CODES:
+            _CANONICAL_FROM_ALIAS[_key] = canonical
 
+# Small int id per (sport, code) team, for bulk matching loops that compare
+# many pairs. Ids never collide across leagues; sport-less lookups only cover
+# aliases that name a single team ("boston" is left out, "celtics" is not).
+_TEAM_IDS: Dict[TeamKey, int] = {
+    (sport, c): i for i, (sport, c) in enumerate(
+        (sport, c) for sport, teams in _SPORT_TEAMS.items() for c in teams
+    )
+}
+_ID_BY_SPORT: Dict[Tuple[str, str], int] = {
+    (sport, a): _TEAM_IDS[(sport, c)] for (sport, a), c in _CANONICAL_BY_SPORT.items()
+}
+_ID_FROM_ALIAS: Dict[str, int] = {
+    a: _TEAM_IDS[next(iter(keys))] for a, keys in _KEYS_FROM_ALIAS.items() if len(keys) == 1
+}
 
-def normalize(name: str) -> str:
-    return re.sub(r'[^a-z0-9]', '', name.lower().strip())
+# Character trie over normalized aliases (every sport): nested dicts, with
+# "" marking the end of an alias
+_ALIAS_TRIE: Dict[str, dict] = {}
+for _alias in _KEYS_FROM_ALIAS:
+    _node = _ALIAS_TRIE
+    for _ch in _alias:
+        _node = _node.setdefault(_ch, {})
+    _node[""] = True
+
+
+def _alias_prefix_end(text: str, start: int = 0) -> int:
+    """End index of the longest alias in normalized text starting at start,
+    or start if no alias matches there."""
+    node = _ALIAS_TRIE
+    end = start
+    for i in range(start, len(text)):
+        node = node.get(text[i])
+        if node is None:
+            break
+        if "" in node:
+            end = i + 1
+    return end
+
+
+def get_team_aliases(sport: Optional[str] = None) -> Dict[str, Set[str]]:
+    """Alias table for one sport, or the merged table if sport is unknown."""
+    return _SPORT_TEAMS.get(sport, TEAM_ALIASES) if sport else TEAM_ALIASES
 
 
-def get_canonical(name: str) -> Optional[str]:
+@lru_cache(maxsize=2048)
+def get_canonical(name: str, sport: Optional[str] = None) -> Optional[str]:
+    """Team code for name; without a known sport, only unambiguous aliases resolve."""
     if not name:
         return None
-    return _CANONICAL_FROM_ALIAS.get(normalize(name))
+    key = normalize(name)
+    if sport in _SPORT_TEAMS:
+        return _CANONICAL_BY_SPORT.get((sport, key))
+    return _CANONICAL_FROM_ALIAS.get(key)
+
+
+@lru_cache(maxsize=2048)
+def get_canonical_id(name: str, sport: Optional[str] = None) -> Optional[int]:
+    """Int id of the (sport, code) team name refers to, or None if unknown/ambiguous."""
+    if not name:
+        return None
+    key = normalize(name)
+    if sport in _SPORT_TEAMS:
+        return _ID_BY_SPORT.get((sport, key))
+    return _ID_FROM_ALIAS.get(key)
+
+
+def is_same_team_id(name1: str, name2: str, sport: Optional[str] = None) -> bool:
+    """Like is_same_team, but only for names that resolve to one team (no raw-name fallback)."""
+    id1 = get_canonical_id(name1, sport)
+    return id1 is not None and id1 == get_canonical_id(name2, sport)
+
+
+def match_team_pairs(
+    left: List[Tuple[str, str]], right: List[Tuple[str, str]], sport: Optional[str] = None
+) -> List[Tuple[int, int]]:
+    """Index pairs (i, j) where left[i] and right[j] are the same matchup.
+    
+    Home/away order is ignored. Pairs with an unknown or ambiguous team
+    never match. Hash join on canonical ids: O(N + M) instead of comparing
+    every pair.
+    """
+    index: Dict[Tuple[int, int], List[int]] = {}
+    for j, (a, b) in enumerate(right):
+        ia, ib = get_canonical_id(a, sport), get_canonical_id(b, sport)
+        if ia is not None and ib is not None:
+            index.setdefault((ia, ib) if ia <= ib else (ib, ia), []).append(j)
+    
+    matches: List[Tuple[int, int]] = []
+    for i, (a, b) in enumerate(left):
+        ia, ib = get_canonical_id(a, sport), get_canonical_id(b, sport)
+        if ia is None or ib is None:
+            continue
+        for j in index.get((ia, ib) if ia <= ib else (ib, ia), ()):
+            matches.append((i, j))
+    return matches
 
 
-def is_same_team(name1: str, name2: str) -> bool:
+def is_same_team(name1: str, name2: str, sport: Optional[str] = None) -> bool:
     if not name1 or not name2:
         return False
-    c1 = get_canonical(name1)
-    c2 = get_canonical(name2)
-    if c1 and c2:
-        return c1 == c2
-    return normalize(name1) == normalize(name2)
+    k1 = normalize(name1)
+    k2 = normalize(name2)
+    if k1 == k2:
+        return True
+    # Different spellings only match through a shared canonical
+    if sport in _SPORT_TEAMS:
+        c1 = _CANONICAL_BY_SPORT.get((sport, k1))
+        return c1 is not None and c1 == _CANONICAL_BY_SPORT.get((sport, k2))
+    # No sport: same team if some league maps both names to one (sport, code)
+    keys1 = _KEYS_FROM_ALIAS.get(k1)
+    return keys1 is not None and not keys1.isdisjoint(_KEYS_FROM_ALIAS.get(k2, ()))
 
 
 def extract_teams_from_slug(slug: str) -> Tuple[Optional[str], Optional[str]]:
-    parts = slug.split('-')
-    if len(parts) >= 3:
-        return parts[1], parts[2]
+    # Segments 1 and 2 of "sport-team1-team2-...", sliced without building a list
+    a = slug.find('-')
+    b = slug.find('-', a + 1) if a >= 0 else -1
+    if b >= 0:
+        c = slug.find('-', b + 1)
+        return slug[a + 1:b], slug[b + 1:c if c >= 0 else len(slug)]
+    # Undelimited slug: accept only if it is exactly two known aliases back to
+    # back, naming two different teams from the same league. Like the
+    # delimited branch, return the alias text, not canonical codes.
+    text = normalize(slug)
+    end = _alias_prefix_end(text)
+    if 0 < end < len(text) and _alias_prefix_end(text, end) == len(text):
+        team1, team2 = text[:end], text[end:]
+        keys1, keys2 = _KEYS_FROM_ALIAS[team1], _KEYS_FROM_ALIAS[team2]
+        if keys1.isdisjoint(keys2) and {s for s, _ in keys1} & {s for s, _ in keys2}:
+            return team1, team2
     return None, None
 
 
 def extract_teams_from_ticker(ticker: str) -> Tuple[Optional[str], Optional[str]]:
-    ticker = re.sub(r'^KX', '', ticker)
-    ticker = re.sub(r'GAME-?\d*[A-Z]*', '', ticker)
-    match = re.search(r'([A-Z]{3})([A-Z]{3,4})$', ticker)
+    ticker = _RE_GAME.sub('', _RE_KX.sub('', ticker))
+    match = _RE_TEAMS.search(ticker)
     if match:
         return match.group(1).lower(), match.group(2).lower()
     return None, None
@@ -0,0 +1,38 @@
+"""
+Trade Deduplication
+
+Bounded memory of already-seen trade IDs for the polling/stream loops.
+"""
+
+from collections import OrderedDict
+
+
+class SeenTrades:
+    """Fixed-size set of trade IDs with least-recently-seen eviction.
+
+    Membership is an O(1) dict lookup; once ``maxlen`` IDs are held the one
+    seen longest ago is forgotten, so long-running bots don't grow without
+    bound. Every hit refreshes an ID, so trades still present in a polled
+    feed never age out (and get copied again) however busy other wallets are.
+    """
+
+    def __init__(self, maxlen: int = 4096):
+        self._ids: OrderedDict = OrderedDict()
+        self._maxlen = maxlen
+
+    def add(self, trade_id: str) -> bool:
+        """Record ``trade_id``; return True if it had not been seen."""
+        ids = self._ids
+        if trade_id in ids:
+            ids.move_to_end(trade_id)
+            return False
+        if len(ids) >= self._maxlen:
+            ids.popitem(last=False)
+        ids[trade_id] = None
+        return True
+
+    def __contains__(self, trade_id: str) -> bool:
+        return trade_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -5,24 +5,49 @@ Executes actual trades on Polymarket CLOB with proper EIP-712 signing.
 """
 
 import asyncio
-import json
+import logging
 import time
 import os
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import coincurve
 import httpx
+import orjson
 from dotenv import load_dotenv
 from web3 import Web3
+from eth_abi import encode as abi_encode
 from eth_account.signers.local import LocalAccount
 from eth_account import Account
 
+from src.services.eip712 import sign_digest, typed_data_digest
+from src.services.http_clients import get_shared_client, close_shared_client
+
 load_dotenv()
 
+_keccak = Web3.keccak
+
+# EIP-712 Order struct: typehash || abi-encoded fields
+_ORDER_TYPEHASH = _keccak(
+    text="Order(uint256 nonce,uint256 expiration,address maker,uint256 tokenId,"
+         "uint8 side,uint256 size,uint256 price)"
+)
+_ORDER_TYPES = ("bytes32", "uint256", "uint256", "address", "uint256", "uint8", "uint256", "uint256")
+_SIDE_INDEX = {"buy": 0, "sell": 1}
+
+# Read-cache TTLs: books move every tick, market metadata is near-static
+_BOOK_TTL = 0.5
+_MARKET_TTL = 60.0
+_CACHE_MAX = 1024
+
 ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY", "")
 
+# Child of pm_copy: entry points call pm_executor.start_log_listener() so its
+# INFO records reach stdout (logging's last-resort handler shows WARNING+ only)
+log = logging.getLogger("pm_copy.executor")
+
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     success: bool
     order_id: Optional[str]
@@ -32,10 +57,14 @@ class ExecutionResult:
     filled_price: float
     gas_used: float
     error: Optional[str]
-    timestamp: datetime
+    timestamp_ns: int
 
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutorConfig:
     rpc_url: str
     wallet_address: str
@@ -43,6 +72,8 @@ class ExecutorConfig:
     api_url: str = "https://api.polymarket.com"
     signing_api_url: str = "https://clob.polymarket.com"
     slippage_tolerance: float = 0.05
+    delay_seconds: float = 0.0       # Fixed wait before copying a signal
+    anti_frontrun: bool = False      # Add size-scaled delay (size/100s, capped at 10s)
 
 
 class PolymarketClient:
@@ -51,90 +82,98 @@ class PolymarketClient:
     CLOB_URL = "https://clob.polymarket.com"
     API_URL = "https://api.polymarket.com"
 
-    def __init__(self, wallet_address: str, private_key: str):
-        self.wallet_address = wallet_address.lower() if wallet_address.startswith("0x") else wallet_address
-        self.w3 = Web3(Web3.HTTPProvider(f"https://polygon-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"))
+    def __init__(self, wallet_address: str, private_key: str,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.wallet_address = wallet_address.lower()
+        self._w3: Optional[Web3] = None
         self.account: LocalAccount = Account.from_key(private_key)
-        self.session = httpx.AsyncClient(timeout=30.0)
-        self.session.headers.update({
+        self._signer = coincurve.PrivateKey(bytes(self.account.key))
+        # Injected client, or None to use the shared keep-alive pool (see session)
+        self._client = client
+        # Last nonce used; fetched once, then incremented locally per order
+        self._nonce_cache: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        # key -> (monotonic ts, value); one lock per key so concurrent misses fetch once
+        self._market_cache: Dict[str, tuple] = {}
+        self._book_cache: Dict[tuple, tuple] = {}
+        self._fetch_locks: Dict[Any, asyncio.Lock] = {}
+        # Read once; every signed CLOB request reuses this dict
+        self._api_headers: Dict[str, str] = {
             "Content-Type": "application/json",
             "Accept": "application/json",
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Origin": "https://polymarket.com",
-            "Referer": "https://polymarket.com/"
-        })
+            "Poly-Api-Key": os.getenv("POLYMARKET_API_KEY", "")
+        }
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """HTTP client for requests; resolved per use so a closed shared pool is rebuilt."""
+        return self._client if self._client is not None else get_shared_client()
+
+    @property
+    def w3(self) -> Web3:
+        """Polygon RPC handle, built on first use - order signing never needs it."""
+        if self._w3 is None:
+            self._w3 = Web3(Web3.HTTPProvider(
+                f"https://polygon-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}",
+                request_kwargs={"timeout": 5}
+            ))
+        return self._w3
 
     async def close(self):
-        await self.session.aclose()
+        """No-op: the session is shared (see close_shared_client)."""
 
     def _get_api_key_headers(self) -> Dict[str, str]:
         """Get headers with API key for CLOB operations."""
-        return {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Poly-Api-Key": os.getenv("POLYMARKET_API_KEY", "")
-        }
+        return self._api_headers
+
+    def _order_struct_hash(self, token_id: str, side: str, size: float, price: float,
+                           nonce: int, expiration: int) -> bytes:
+        """EIP-712 hashStruct of the order: keccak(typehash || abi-encoded fields)."""
+        token_int = int(token_id, 16) if token_id.startswith("0x") else int(token_id)
+        return _keccak(abi_encode(_ORDER_TYPES, (
+            _ORDER_TYPEHASH,
+            nonce,
+            expiration,
+            self.wallet_address,
+            token_int,
+            _SIDE_INDEX[side.lower()],
+            int(size * 1e6),
+            int(price * 1e6),
+        )))
 
     def _sign_order(self, token_id: str, side: str, size: float, price: float,
                     nonce: int, expiration: int) -> str:
-        """Sign an order using EIP-712 for Polymarket CLOB."""
-        from web3 import Web3
-        import hashlib
-
-        chain_id = 137
-        domain_separator = hashlib.new('sha3_256')
-        domain_separator.update(b'\x19\x01')
-        domain_data = {
-            "name": "Polymarket",
-            "version": "1",
-            "chainId": chain_id,
-            "verifyingContract": "0x0000000000000000000000000000000000000000"
-        }
-
-        eip712_domain_hash = self._hash_eip712_domain(domain_data)
-
-        order_hash = Web3.keccak(
-            text=f"{nonce}{expiration}{self.wallet_address}{token_id}{side}{int(size * 1e6)}{int(price * 1e6)}"
-        )
-
-        return f"0x{order_hash.hex()}"
-
-    def _hash_eip712_domain(self, domain: Dict) -> bytes:
-        """Hash EIP712 domain separator."""
-        import hashlib
-
-        types = ["name", "version", "chainId", "verifyingContract"]
-        values = [domain.get(t, "") for t in types]
-
-        type_hash = b"\x36\xa7\x9d\x63\x12\x6f\x12\x4d\xf7\x3a\x6d\xc4\xe3\x2e\x46\xaa\x7d\xb1\x0f\x11\x43\x49\xc4\x5f\x89\x26\x65\x6d\x56\x1c\x04"
-        domain_type_hash = hashlib.new('sha3_256')
-        domain_type_hash.update(type_hash)
-
-        encoded_values = b""
-        for val in values:
-            if isinstance(val, int):
-                encoded_values += val.to_bytes(32, 'big')
-            elif isinstance(val, str) and val.startswith("0x"):
-                encoded_values += bytes.fromhex(val[2:]).rjust(32, b'\x00')
-            else:
-                encoded_values += val.encode().ljust(32, b'\x00')
-
-        return Web3.keccak(b"\x19\x01" + Web3.keccak(domain_type_hash.digest() + encoded_values))
+        """Sign an order using EIP-712 for Polymarket CLOB.
+        
+        Returns the 65-byte r || s || v signature over the order's typed-data
+        digest, not the digest itself.
+        """
+        struct_hash = self._order_struct_hash(token_id, side, size, price, nonce, expiration)
+        return sign_digest(self._signer, typed_data_digest(struct_hash))
 
     async def get_nonce(self) -> int:
         """Get current nonce for the wallet."""
         try:
             resp = await self.session.get(
                 f"{self.CLOB_URL}/profile",
-                params={"wallet": self.wallet_address.lower()}
+                params={"wallet": self.wallet_address}
             )
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 return int(data.get("nonce", 0))
         except Exception:
             pass
         return int(time.time() * 1000)
 
+    async def _next_nonce(self) -> int:
+        """Next order nonce without a /profile round-trip in the steady state."""
+        async with self._nonce_lock:
+            if self._nonce_cache is None:
+                self._nonce_cache = await self.get_nonce()
+            else:
+                self._nonce_cache += 1
+            return self._nonce_cache
+
     async def place_order(
         self,
         token_id: str,
@@ -144,7 +183,7 @@ class PolymarketClient:
         expiration: int = 0
     ) -> Dict[str, Any]:
         """Place an order on Polymarket CLOB with proper signing."""
-        nonce = await self.get_nonce()
+        nonce = await self._next_nonce()
         if expiration == 0:
             expiration = int(time.time()) + 86400 * 7
 
@@ -158,19 +197,21 @@ class PolymarketClient:
             "nonce": nonce,
             "expiration": expiration,
             "signature": signature,
-            "maker": self.wallet_address.lower()
+            "maker": self.wallet_address
         }
 
         try:
             resp = await self.session.post(
                 f"{self.CLOB_URL}/order",
-                json=order_payload,
+                content=orjson.dumps(order_payload),
                 headers=self._get_api_key_headers()
             )
 
             if resp.status_code == 200:
-                return resp.json()
+                return orjson.loads(resp.content)
             else:
+                if resp.status_code == 409 or "nonce" in resp.text.lower():
+                    self._nonce_cache = None  # Out of sync - re-fetch on next order
                 return {
                     "orderId": f"order_{nonce}",
                     "status": "ERROR",
@@ -185,44 +226,82 @@ class PolymarketClient:
                 "msg": "Exception during order placement"
             }
 
-    async def get_market(self, condition_id: str) -> Optional[Dict[str, Any]]:
-        """Get market info by condition ID."""
+    async def _cached(self, cache: Dict, key: Any, ttl: float, fetch) -> Optional[Any]:
+        """Return a fresh cached value for ``key`` or fetch it; failures (None) aren't cached."""
+        hit = cache.get(key)
+        if hit and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+
+        lock = self._fetch_locks.get(key)
+        if lock is None:
+            if len(self._fetch_locks) >= _CACHE_MAX:
+                self._fetch_locks.clear()
+            lock = self._fetch_locks[key] = asyncio.Lock()
+
+        async with lock:
+            # Another waiter may have filled it while we queued
+            hit = cache.get(key)
+            if hit and time.monotonic() - hit[0] < ttl:
+                return hit[1]
+            value = await fetch()
+            if value is not None:
+                if len(cache) >= _CACHE_MAX:
+                    cache.clear()
+                cache[key] = (time.monotonic(), value)
+            return value
+
+    async def _fetch_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Optional[Any]:
         try:
-            resp = await self.session.get(
-                f"{self.API_URL}/markets/{condition_id}"
-            )
+            resp = await self.session.get(url, params=params)
             if resp.status_code == 200:
-                return resp.json()
-            return None
+                return orjson.loads(resp.content)
         except Exception:
-            return None
+            pass
+        return None
+
+    async def get_market(self, condition_id: str) -> Optional[Dict[str, Any]]:
+        """Get market info by condition ID (cached for 60s)."""
+        return await self._cached(
+            self._market_cache, condition_id, _MARKET_TTL,
+            lambda: self._fetch_json(f"{self.API_URL}/markets/{condition_id}")
+        )
 
     async def get_order_book(self, condition_id: str, token_id: str) -> Dict[str, Any]:
-        """Get order book for a market."""
-        try:
-            resp = await self.session.get(
+        """Get order book for a market (cached for 500ms)."""
+        book = await self._cached(
+            self._book_cache, (condition_id, token_id), _BOOK_TTL,
+            lambda: self._fetch_json(
                 f"{self.API_URL}/order-book",
                 params={"conditionId": condition_id, "tokenId": token_id}
             )
-            if resp.status_code == 200:
-                return resp.json()
-            return {"bids": [], "asks": []}
-        except Exception:
-            return {"bids": [], "asks": []}
+        )
+        return book if book is not None else {"bids": [], "asks": []}
 
 
 class TradeExecutor:
     """Executes copy trades on Polymarket."""
     
-    def __init__(self, config: ExecutorConfig):
+    def __init__(self, config: ExecutorConfig, client: Optional[httpx.AsyncClient] = None):
         self.config = config
         self.client = PolymarketClient(
             wallet_address=config.wallet_address,
-            private_key=config.private_key
+            private_key=config.private_key,
+            client=client
         )
+        # Injected clients belong to the caller; otherwise we're on the shared pool
+        self._owns_client = client is None
+        # Bounds concurrent copy trades to stay under CLOB rate limits
+        self._sem = asyncio.Semaphore(8)
     
     async def close(self):
+        """Close the shared HTTP pool if we're using it; an injected client is left to its owner.
+
+        Clients on the shared pool look it up per request, so other executors
+        get a fresh pool from get_shared_client() rather than the closed one.
+        """
         await self.client.close()
+        if self._owns_client:
+            await close_shared_client()
     
     async def execute_trade(
         self,
@@ -232,8 +311,6 @@ class TradeExecutor:
         price: float
     ) -> ExecutionResult:
         """Execute a trade on Polymarket."""
-        start_time = time.time()
-        
         try:
             # Place order
             order_result = await self.client.place_order(
@@ -254,7 +331,7 @@ class TradeExecutor:
                 filled_price=price * 1.01,  # Simulated
                 gas_used=gas_estimate,
                 error=None,
-                timestamp=datetime.now()
+                timestamp_ns=time.time_ns()
             )
             
         except Exception as e:
@@ -267,7 +344,7 @@ class TradeExecutor:
                 filled_price=0,
                 gas_used=0,
                 error=str(e),
-                timestamp=datetime.now()
+                timestamp_ns=time.time_ns()
             )
     
     async def execute_copy_trade(
@@ -281,20 +358,19 @@ class TradeExecutor:
         kelly_fraction: float = 0.5
     ) -> ExecutionResult:
         """Execute a copy trade with proper sizing."""
-        print(f"\n📋 Copy Trade Signal:")
-        print(f"   Trader: {trader_wallet[:8]}...")
-        print(f"   Side: {side.upper()}")
-        print(f"   Token: {token_id[:16]}...")
-        print(f"   Trader Size: ${trader_size:.2f}")
-        print(f"   My Size: ${my_position_size:.2f}")
-        print(f"   Price: ${trader_price:.4f}")
-        print(f"   Kelly: {kelly_fraction}x")
-        
-        # Smart delay - larger positions get more delay to avoid front-running
-        delay = 2.0 + (my_position_size / 100)
-        print(f"   Delay: {delay:.1f}s")
+        delay = self.config.delay_seconds
+        if self.config.anti_frontrun:
+            # Larger positions get more delay to avoid front-running
+            delay = min(delay + my_position_size / 100, 10)
+        log.info(
+            "📋 copy_trade trader=%.8s side=%s token=%.16s trader_size=$%.2f "
+            "size=$%.2f price=$%.4f kelly=%sx delay=%.1fs",
+            trader_wallet, side, token_id, trader_size,
+            my_position_size, trader_price, kelly_fraction, delay
+        )
         
-        await asyncio.sleep(min(delay, 10))
+        if delay > 0:
+            await asyncio.sleep(delay)
         
         return await self.execute_trade(
             token_id=token_id,
@@ -303,20 +379,71 @@ class TradeExecutor:
             price=trader_price
         )
     
+    async def _run_bounded(
+        self,
+        fn: Callable[..., Awaitable[ExecutionResult]],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        size: float,
+        price: float
+    ) -> ExecutionResult:
+        """Run one order under the rate-limit semaphore; a raise becomes a failed result."""
+        try:
+            async with self._sem:
+                return await fn(*args, **kwargs)
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                order_id=None,
+                transaction_hash=None,
+                size=size,
+                price=price,
+                filled_price=0,
+                gas_used=0,
+                error=str(e),
+                timestamp_ns=time.time_ns()
+            )
+
+    async def execute_trades_batch(
+        self,
+        specs: List[Tuple[str, str, float, float]]
+    ) -> List[ExecutionResult]:
+        """Place several (token_id, side, size, price) orders concurrently.
+
+        Orders share the keep-alive pool, so K orders cost ~1 RTT instead of K.
+        Results map 1:1 onto specs; a failed order is an ExecutionResult with
+        success=False, never an exception.
+        """
+        return await asyncio.gather(*[
+            self._run_bounded(self.execute_trade, spec, {}, spec[2], spec[3])
+            for spec in specs
+        ])
+
+    async def execute_copy_trades(self, signals: List[Dict[str, Any]]) -> List[ExecutionResult]:
+        """Execute several copy signals concurrently.
+        
+        Each signal is the keyword arguments for execute_copy_trade. Any
+        configured delays overlap; same result contract as execute_trades_batch.
+        """
+        return await asyncio.gather(*[
+            self._run_bounded(
+                self.execute_copy_trade, (), signal,
+                signal.get("my_position_size", 0.0), signal.get("trader_price", 0.0)
+            )
+            for signal in signals
+        ])
+    
     async def check_balance(self) -> Dict[str, float]:
         """Check wallet USDC balance."""
         try:
             resp = await self.client.session.get(
                 f"https://api.polymarket.com/api/wallet/balances",
-                params={"wallet": self.config.wallet_address}
+                params={"wallet": self.client.wallet_address}
             )
             if resp.status_code == 200:
-                data = resp.json()
-                balances = {}
-                for b in data.get("balances", []):
-                    if b.get("symbol") == "USDC":
-                        balances["USDC"] = float(b.get("balance", 0))
-                return balances
+                data = orjson.loads(resp.content)
+                usdc = next((b for b in data.get("balances", ()) if b.get("symbol") == "USDC"), None)
+                return {"USDC": float(usdc.get("balance", 0))} if usdc else {}
             return {"USDC": 0.0}
         except Exception:
             return {"USDC": 0.0}
@@ -329,15 +456,16 @@ async def test_connection():
     
     # For now, just check if API is reachable
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get("https://api.polymarket.com/markets", params={"limit": 1})
-            print(f"API Status: {resp.status_code}")
-            if resp.status_code == 200:
-                print("✅ Polymarket API is reachable")
-            else:
-                print("⚠️ API returned non-200 status")
+        resp = await get_shared_client().get("https://api.polymarket.com/markets", params={"limit": 1})
+        print(f"API Status: {resp.status_code}")
+        if resp.status_code == 200:
+            print("✅ Polymarket API is reachable")
+        else:
+            print("⚠️ API returned non-200 status")
     except Exception as e:
         print(f"❌ API Error: {e}")
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
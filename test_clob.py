@@ -4,6 +4,7 @@
 import asyncio
 import json
 import os
+import sys
 from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
@@ -16,7 +17,7 @@ ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY", "")
 POLYMARKET_API_KEY = os.getenv("POLYMARKET_API_KEY", "")
 
 
-async def test_clob_connection():
+async def run_clob_connection():
     """Test CLOB connection and order placement."""
     print("=" * 60)
     print("Testing Polymarket CLOB Connection")
@@ -43,7 +44,7 @@ async def test_clob_connection():
     return nonce
 
 
-async def test_small_order():
+async def run_small_order():
     """Test placing a small order."""
     print("\n" + "=" * 60)
     print("Testing Small Order Placement")
@@ -80,10 +81,10 @@ async def test_small_order():
 async def main():
     """Main test function."""
     try:
-        nonce = await test_clob_connection()
+        nonce = await run_clob_connection()
 
         if nonce:
-            result = await test_small_order()
+            result = await run_small_order()
 
             if result.get("status") == "SUBMITTED":
                 print("\n✅ Order placed successfully!")
@@ -96,7 +97,12 @@ async def main():
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        from src.services.http_clients import close_shared_client
+        await close_shared_client()
 
 
 if __name__ == "__main__":
+    if not os.getenv("PRIVATE_KEY"):
+        sys.exit("PRIVATE_KEY not set - nothing to sign orders with")
     asyncio.run(main())
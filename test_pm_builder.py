@@ -3,44 +3,42 @@
 
 import asyncio
 import os
+import sys
+import orjson
 from dotenv import load_dotenv
 
+from src.services.http_clients import get_shared_client, close_shared_client
+
 load_dotenv()
 
+_env = {k: os.environ.get(k, "") for k in (
+    "POLYMARKET_BUILDER_API_KEY", "POLYMARKET_BUILDER_SECRET",
+    "POLYMARKET_BUILDER_PASSPHRASE", "PROXY_WALLET", "PRIVATE_KEY",
+)}
+
 # Builder credentials from your PM profile
-BUILDER_API_KEY = os.getenv("POLYMARKET_BUILDER_API_KEY", "")
-BUILDER_SECRET = os.getenv("POLYMARKET_BUILDER_SECRET", "")
-BUILDER_PASSPHRASE = os.getenv("POLYMARKET_BUILDER_PASSPHRASE", "")
+BUILDER_API_KEY = _env["POLYMARKET_BUILDER_API_KEY"]
+BUILDER_SECRET = _env["POLYMARKET_BUILDER_SECRET"]
+BUILDER_PASSPHRASE = _env["POLYMARKET_BUILDER_PASSPHRASE"]
 
 # Your wallet info
-WALLET_ADDRESS = os.getenv("PROXY_WALLET", "")  # Your MetaMask address with USDC
-PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")  # For signing orders
+WALLET_ADDRESS = _env["PROXY_WALLET"]  # Your MetaMask address with USDC
+PRIVATE_KEY = _env["PRIVATE_KEY"]  # For signing orders
 
-async def test_builder_auth():
+async def run_builder_auth():
     """Test if Builder keys work for CLOB API."""
-    import httpx
-    
     print("Testing PM CLOB with Builder API keys...")
     print(f"Wallet: {WALLET_ADDRESS[:10]}..." if WALLET_ADDRESS else "Wallet: NOT SET")
     print(f"Builder Key: {BUILDER_API_KEY[:20]}..." if BUILDER_API_KEY else "Builder Key: NOT SET")
     
-    if not all([BUILDER_API_KEY, BUILDER_SECRET, WALLET_ADDRESS]):
-        print("\n❌ Missing credentials! Need:")
-        print("  - POLYMARKET_BUILDER_API_KEY")
-        print("  - POLYMARKET_BUILDER_SECRET") 
-        print("  - POLYMARKET_BUILDER_PASSPHRASE (optional)")
-        print("  - PROXY_WALLET (your MetaMask address)")
-        return
-    
     # Test 1: Get markets (public, no auth needed)
     print("\n1. Testing public endpoint (markets)...")
-    async with httpx.AsyncClient() as client:
-        resp = await client.get("https://clob.polymarket.com/markets")
-        if resp.status_code == 200:
-            markets = resp.json()
-            print(f"   ✓ Got {len(markets.get('data', []))} markets")
-        else:
-            print(f"   ✗ Failed: {resp.status_code}")
+    resp = await get_shared_client().get("https://clob.polymarket.com/markets")
+    if resp.status_code == 200:
+        markets = orjson.loads(resp.content)
+        print(f"   ✓ Got {len(markets.get('data', []))} markets")
+    else:
+        print(f"   ✗ Failed: {resp.status_code}")
     
     # Test 2: Check wallet balance/orders (requires auth)
     print("\n2. Testing authenticated endpoint (orders)...")
@@ -54,5 +52,19 @@ async def test_builder_auth():
     print("   b. Create signed order with private key")
     print("   c. Submit via CLOB API with Builder auth")
 
+async def main():
+    try:
+        await run_builder_auth()
+    finally:
+        await close_shared_client()
+
 if __name__ == "__main__":
-    asyncio.run(test_builder_auth())
+    # Bail out before starting an event loop
+    if not all([BUILDER_API_KEY, BUILDER_SECRET, WALLET_ADDRESS]):
+        print("❌ Missing credentials! Need:")
+        print("  - POLYMARKET_BUILDER_API_KEY")
+        print("  - POLYMARKET_BUILDER_SECRET")
+        print("  - POLYMARKET_BUILDER_PASSPHRASE (optional)")
+        print("  - PROXY_WALLET (your MetaMask address)")
+        sys.exit(1)
+    asyncio.run(main())
@@ -3,6 +3,8 @@
 
 import asyncio
 import os
+import sys
+from dataclasses import replace
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,15 +17,17 @@ print(f"Balance: ~$231 USDC")
 print("")
 
 # Import after env loaded
-from src.services.pm_executor import PolymarketCopyExecutor, PMCopyConfig
+from src.services.pm_executor import PolymarketCopyExecutor, PMCopyConfig, start_log_listener, use_fast_event_loop
 
-async def test_pm_trade():
+async def run_pm_trade():
     """Place a $1 test trade on PM."""
     
-    config = PMCopyConfig.from_env()
-    config.dry_run = False  # LIVE MODE
-    config.max_position_size = 1.0  # $1 max for test
-    config.max_total_exposure = 5.0  # $5 total for safety
+    config = replace(
+        PMCopyConfig.from_env(),
+        dry_run=False,  # LIVE MODE
+        max_position_size=1.0,  # $1 max for test
+        max_total_exposure=5.0,  # $5 total for safety
+    )
     
     print(f"Config:")
     print(f"  Dry run: {config.dry_run}")
@@ -63,8 +67,15 @@ async def test_pm_trade():
     await executor.close()
 
 if __name__ == "__main__":
+    if not os.getenv("PRIVATE_KEY"):
+        sys.exit("PRIVATE_KEY not set - nothing to sign orders with")
     confirm = input("Place $1 test order on PM? (yes/no): ")
     if confirm.lower() == "yes":
-        asyncio.run(test_pm_trade())
+        use_fast_event_loop()
+        listener = start_log_listener()
+        try:
+            asyncio.run(run_pm_trade())
+        finally:
+            listener.stop()
     else:
         print("Cancelled.")
@@ -3,26 +3,28 @@
 
 import asyncio
 import os
+import sys
+import traceback
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Check credentials
-WALLET = os.getenv("PROXY_WALLET", "")
-API_KEY = os.getenv("POLYMARKET_BUILDER_API_KEY", "")
-SECRET = os.getenv("POLYMARKET_BUILDER_SECRET", "")
-PASSPHRASE = os.getenv("POLYMARKET_BUILDER_PASSPHRASE", "")
-PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")
-ALCHEMY_KEY = os.getenv("ALCHEMY_API_KEY", "")
+# Read credentials once
+_REQUIRED = ("PROXY_WALLET", "POLYMARKET_BUILDER_API_KEY", "POLYMARKET_BUILDER_SECRET",
+             "PRIVATE_KEY", "ALCHEMY_API_KEY")
+_env = {k: os.environ.get(k, "") for k in _REQUIRED + ("POLYMARKET_BUILDER_PASSPHRASE",)}
 
-async def test_pm_order():
+WALLET = _env["PROXY_WALLET"]
+API_KEY = _env["POLYMARKET_BUILDER_API_KEY"]
+SECRET = _env["POLYMARKET_BUILDER_SECRET"]
+PASSPHRASE = _env["POLYMARKET_BUILDER_PASSPHRASE"]
+PRIVATE_KEY = _env["PRIVATE_KEY"]
+ALCHEMY_KEY = _env["ALCHEMY_API_KEY"]
+
+async def run_pm_order():
     """Place a small test order on PM."""
     
-    # Validate setup
-    if not all([WALLET, API_KEY, SECRET, PRIVATE_KEY, ALCHEMY_KEY]):
-        print("❌ Missing credentials!")
-        return
-    
     print("="*60)
     print("PM Order Test - Builder API")
     print("="*60)
@@ -70,10 +72,16 @@ async def test_pm_order():
         
         await client.close()
         
-    except Exception as e:
+    except (ImportError, httpx.HTTPError, RuntimeError, ValueError) as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
+    finally:
+        from src.services.http_clients import close_shared_client
+        await close_shared_client()
 
 if __name__ == "__main__":
-    asyncio.run(test_pm_order())
+    # Validate setup before starting an event loop
+    missing = [k for k in _REQUIRED if not _env[k]]
+    if missing:
+        sys.exit(f"❌ Missing credentials: {', '.join(missing)}")
+    asyncio.run(run_pm_order())
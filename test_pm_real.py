@@ -3,6 +3,7 @@
 
 import asyncio
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,9 +13,9 @@ os.environ['PM_DRY_RUN'] = 'false'
 os.environ['PM_MAX_POSITION_SIZE'] = '1.0'  # $1 max
 os.environ['PM_MAX_TOTAL_EXPOSURE'] = '5.0'  # $5 total
 
-from src.services.pm_executor import PolymarketCopyExecutor, PMCopyConfig
+from src.services.pm_executor import PolymarketCopyExecutor, PMCopyConfig, start_log_listener, use_fast_event_loop
 
-async def test_real_trade():
+async def run_real_trade():
     print("="*60)
     print("Testing PM with REAL order ($1 max)")
     print("="*60)
@@ -42,4 +43,11 @@ async def test_real_trade():
     await executor.close()
 
 if __name__ == "__main__":
-    asyncio.run(test_real_trade())
+    if not os.getenv("PRIVATE_KEY"):
+        sys.exit("PRIVATE_KEY not set - nothing to sign orders with")
+    use_fast_event_loop()
+    listener = start_log_listener()
+    try:
+        asyncio.run(run_real_trade())
+    finally:
+        listener.stop()
@@ -0,0 +1,79 @@
+"""Tests for EIP-712 order hashing helpers."""
+
+import coincurve
+import pytest
+from eth_abi import encode as abi_encode
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from eth_utils import keccak
+
+from src.services.eip712 import (
+    CHAIN_ID,
+    EXCHANGE_ADDRESS,
+    EXCHANGE_DOMAIN,
+    sign_digest,
+    typed_data_digest,
+)
+from src.services.trade_executor import PolymarketClient
+
+_KEY = "0x" + "22" * 32
+
+_DOMAIN_FIELDS = [
+    {"name": "name", "type": "string"},
+    {"name": "version", "type": "string"},
+    {"name": "chainId", "type": "uint256"},
+    {"name": "verifyingContract", "type": "address"},
+]
+
+
+def _reference(x: int):
+    """eth_account's EIP-712 encoding of a one-field message on the exchange domain."""
+    return encode_typed_data(full_message={
+        "types": {"EIP712Domain": _DOMAIN_FIELDS, "Foo": [{"name": "x", "type": "uint256"}]},
+        "primaryType": "Foo",
+        "domain": {
+            "name": "Polymarket CTF Exchange",
+            "version": "1",
+            "chainId": CHAIN_ID,
+            "verifyingContract": EXCHANGE_ADDRESS,
+        },
+        "message": {"x": x},
+    })
+
+
+class TestEIP712:
+    """Test cases against eth_account's reference encoder."""
+
+    def test_domain_separator_matches_reference(self):
+        """Test the cached domain separator is the standard EIP-712 one."""
+        assert EXCHANGE_DOMAIN == bytes(_reference(1).header)
+
+    def test_digest_matches_reference(self):
+        """Test keccak(0x1901 || domain || structHash) equals the reference digest."""
+        reference = _reference(5)
+        struct_hash = keccak(abi_encode(["bytes32", "uint256"], [keccak(text="Foo(uint256 x)"), 5]))
+
+        assert struct_hash == bytes(reference.body)
+        assert typed_data_digest(struct_hash) == keccak(b"\x19" + reference.version + reference.header + reference.body)
+
+    def test_sign_digest_matches_eth_account(self):
+        """Test the libsecp256k1 signature equals eth_account's (RFC 6979, v=27/28)."""
+        digest = keccak(b"order")
+        signer = coincurve.PrivateKey(bytes.fromhex(_KEY[2:]))
+
+        assert sign_digest(signer, digest) == "0x" + Account.unsafe_sign_hash(digest, _KEY).signature.hex()
+
+    def test_order_signature_recovers_to_wallet(self):
+        """Test PolymarketClient signs orders with its key instead of returning the hash."""
+        account = Account.from_key(_KEY)
+        client = PolymarketClient(account.address, _KEY)
+
+        signature = client._sign_order("123", "buy", 1.0, 0.5, nonce=1, expiration=2)
+
+        assert len(bytes.fromhex(signature[2:])) == 65
+        digest = keccak(b"\x19\x01" + EXCHANGE_DOMAIN + client._order_struct_hash("123", "buy", 1.0, 0.5, 1, 2))
+        assert signature == "0x" + account.unsafe_sign_hash(digest).signature.hex()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,19 +1,28 @@
 """Tests for Risk Manager."""
 
+import copy
+
 import pytest
 from src.services.risk_manager import RiskManager, RiskLevel, RiskCheckResult
 
 
+@pytest.fixture(scope="module")
+def _rm_proto():
+    return RiskManager(bankroll=400.0)
+
+
+@pytest.fixture
+def rm(_rm_proto):
+    """Fresh copy of the prototype risk manager for each test."""
+    return copy.deepcopy(_rm_proto)
+
+
 class TestRiskManager:
     """Test cases for RiskManager."""
     
-    def setup_method(self):
-        """Set up risk manager for each test."""
-        self.rm = RiskManager(bankroll=400.0)
-    
-    def test_normal_position_approved(self):
+    def test_normal_position_approved(self, rm):
         """Test that normal positions are approved."""
-        result = self.rm.check_position(
+        result = rm.check_position(
             trader_wallet="0xabc123",
             proposed_size=5.0,
             current_trader_pnl=100.0,
@@ -23,9 +32,9 @@ class TestRiskManager:
         assert result.approved is True
         assert result.final_position_size == 5.0
     
-    def test_oversized_position_capped(self):
+    def test_oversized_position_capped(self, rm):
         """Test that oversized positions are capped."""
-        result = self.rm.check_position(
+        result = rm.check_position(
             trader_wallet="0xabc123",
             proposed_size=50.0,  # 12.5% of bankroll
             current_trader_pnl=100.0,
@@ -36,14 +45,14 @@ class TestRiskManager:
         assert result.final_position_size == 8.0  # Max $8
         assert "exceeds max" in result.warnings[0].lower()
     
-    def test_trader_exposure_limit(self):
+    def test_trader_exposure_limit(self, rm):
         """Test per-trader exposure limit."""
         # Add $5 exposure to trader A (1.25%)
-        self.rm.trader_exposures["0xtraderA"] = 1.25
-        self.rm._update_total_exposure()
+        rm.trader_exposures["0xtradera"] = 1.25  # keys are lowercased
+        rm.recompute_total_exposure()
         
         # Try to add more
-        result = self.rm.check_position(
+        result = rm.check_position(
             trader_wallet="0xtraderA",
             proposed_size=35.0,  # Would be 8.75%, total 10%
             current_trader_pnl=50.0,
@@ -54,12 +63,12 @@ class TestRiskManager:
         assert result.final_position_size < 35.0
         assert "exceed" in result.warnings[0].lower()
     
-    def test_drawdown_reduction(self):
+    def test_drawdown_reduction(self, rm):
         """Test drawdown-based position reduction."""
         # Simulate 12% drawdown
-        self.rm.update_bankroll(352.0, peak_bankroll=400.0)
+        rm.update_bankroll(352.0, peak_bankroll=400.0)
         
-        result = self.rm.check_position(
+        result = rm.check_position(
             trader_wallet="0xnewtrader",
             proposed_size=6.0,
             current_trader_pnl=0.0,
@@ -70,44 +79,65 @@ class TestRiskManager:
         assert result.final_position_size < 6.0
         assert "drawdown" in result.warnings[0].lower()
     
-    def test_update_bankroll(self):
+    def test_update_bankroll(self, rm):
         """Test bankroll update and drawdown calculation."""
         # Initial state
-        assert self.rm.bankroll == 400.0
-        assert self.rm.current_drawdown == 0.0
+        assert rm.bankroll == 400.0
+        assert rm.current_drawdown == 0.0
         
         # After loss
-        self.rm.update_bankroll(360.0)
-        assert self.rm.bankroll == 360.0
-        assert self.rm.current_drawdown == 10.0  # (400-360)/400*100
+        rm.update_bankroll(360.0)
+        assert rm.bankroll == 360.0
+        assert rm.current_drawdown == 10.0  # (400-360)/400*100
     
-    def test_reset(self):
+    def test_add_remove_trader_exposure(self, rm):
+        """Test total exposure tracks add/remove incrementally."""
+        rm.add_trader_exposure("0xtraderA", 8.0)   # 2%
+        rm.add_trader_exposure("0xtraderB", 4.0)   # 1%
+        assert abs(rm.current_exposure_percent - 3.0) < 1e-9
+
+        # Removing more than held clamps the trader at zero
+        rm.remove_trader_exposure("0xtraderA", 12.0)
+        assert rm.trader_exposures["0xtradera"] == 0.0
+        assert abs(rm.current_exposure_percent - 1.0) < 1e-9
+
+    def test_wallet_case_shares_exposure(self, rm):
+        """Test that differently-cased addresses hit the same exposure bucket."""
+        rm.add_trader_exposure("0xAbCdEf", 24.0)  # 6%
+        rm.add_trader_exposure("0xabcdef", 12.0)  # 3%
+        assert list(rm.trader_exposures) == ["0xabcdef"]
+
+        # 9% already held, so only $4 (1%) is left for this trader
+        result = rm.check_position(trader_wallet="0xABCDEF", proposed_size=8.0)
+        assert result.final_position_size == pytest.approx(4.0)
+
+    def test_reset(self, rm):
         """Test reset functionality."""
-        self.rm.trader_exposures = {"0xtest": 5.0}
-        self.rm.current_drawdown = 10.0
+        rm.trader_exposures = {"0xtest": 5.0}
+        rm.current_drawdown = 10.0
         
-        self.rm.reset()
+        rm.reset()
         
-        assert self.rm.trader_exposures == {}
-        assert self.rm.current_drawdown == 0.0
+        assert rm.trader_exposures == {}
+        assert rm.current_drawdown == 0.0
     
-    def test_get_risk_summary(self):
+    def test_get_risk_summary(self, rm):
         """Test risk summary generation."""
-        self.rm.update_bankroll(380.0, peak_bankroll=400.0)
+        rm.update_bankroll(380.0, peak_bankroll=400.0)
         
-        summary = self.rm.get_risk_summary()
+        summary = rm.get_risk_summary()
         
         assert summary["bankroll"] == 380.0
         assert summary["current_drawdown"] == 5.0
         assert abs(summary["max_trade_size"] - 7.6) < 0.01  # 2% of 380
         assert "trader_exposures" in summary
     
-    def test_position_too_small_after_reduction(self):
+    def test_position_too_small_after_reduction(self, rm):
         """Test skipping position if too small after reduction."""
         # High drawdown
-        self.rm.update_bankroll(200.0, peak_bankroll=400.0)  # 50% drawdown
+        rm.update_bankroll(200.0, peak_bankroll=400.0)  # 50% drawdown
         
-        result = self.rm.check_position(
+        result = rm.check_position(
             trader_wallet="0xtest",
             proposed_size=1.0,
             current_trader_pnl=0.0,
@@ -117,9 +147,9 @@ class TestRiskManager:
         # Should be rejected or very small
         assert result.final_position_size < 1.0 or result.approved is False
     
-    def test_suggested_multiplier(self):
+    def test_suggested_multiplier(self, rm):
         """Test suggested multiplier calculation."""
-        result = self.rm.check_position(
+        result = rm.check_position(
             trader_wallet="0xtest",
             proposed_size=4.0,  # Half of max $8
             trader_win_rate=0.60
@@ -0,0 +1,158 @@
+"""Tests for team name mappings."""
+
+import pytest
+from src.services.team_mappings import (
+    extract_teams_from_slug,
+    get_canonical,
+    get_canonical_id,
+    is_same_team,
+    is_same_team_id,
+    match_team_pairs,
+)
+
+
+class TestSameTeam:
+    """Test cases for is_same_team / get_canonical across leagues."""
+
+    @pytest.mark.parametrize("name1,name2", [
+        ("celtics", "bruins"),      # both "bos"
+        ("capitals", "wizards"),    # both "wsh"
+        ("bulls", "blackhawks"),    # both "chi"
+        ("mavericks", "stars"),     # both "dal"
+    ])
+    def test_shared_code_teams_differ(self, name1, name2):
+        """Test that teams sharing a Kalshi code in different leagues don't match."""
+        assert is_same_team(name1, name2) is False
+        assert is_same_team(name1, name2, "nba") is False
+        assert is_same_team(name1, name2, "nhl") is False
+
+    def test_aliases_match_within_sport(self):
+        """Test that aliases resolve to the team for the given sport."""
+        assert is_same_team("celtics", "bos", "nba") is True
+        assert is_same_team("bruins", "bos", "nhl") is True
+        assert is_same_team("celtics", "bos", "nhl") is False
+        assert is_same_team("Golden State", "warriors") is True
+
+    def test_sportless_city_matches_any_league(self):
+        """Test that an ambiguous city still matches a nickname it covers."""
+        assert is_same_team("boston", "celtics") is True
+        assert is_same_team("boston", "bruins") is True
+
+    def test_get_canonical_shared_code_needs_sport(self):
+        """Test that codes reused across leagues only resolve with a sport."""
+        assert get_canonical("celtics") is None
+        assert get_canonical("celtics", "nba") == "bos"
+        assert get_canonical("bruins", "nhl") == "bos"
+        assert get_canonical("bruins", "nba") is None
+        assert get_canonical("warriors") == "gsw"  # unique code, no sport needed
+
+
+class TestCanonicalIds:
+    """Test cases for integer team ids."""
+
+    @pytest.mark.parametrize("name1,name2", [
+        ("celtics", "bruins"),
+        ("capitals", "wizards"),
+        ("bulls", "blackhawks"),
+    ])
+    def test_shared_code_teams_get_different_ids(self, name1, name2):
+        """Test that teams sharing a Kalshi code across leagues have distinct ids."""
+        id1, id2 = get_canonical_id(name1), get_canonical_id(name2)
+        assert id1 is not None and id2 is not None
+        assert id1 != id2
+        assert is_same_team_id(name1, name2) is False
+
+    def test_ambiguous_alias_needs_sport(self):
+        """Test that aliases shared across leagues only get an id with a sport."""
+        assert get_canonical_id("boston") is None
+        assert get_canonical_id("bos") is None
+        assert get_canonical_id("boston", "nba") == get_canonical_id("celtics")
+        assert get_canonical_id("bos", "nhl") == get_canonical_id("bruins")
+
+    def test_is_same_team_id_with_sport(self):
+        """Test id comparison within a sport."""
+        assert is_same_team_id("celtics", "bos", "nba") is True
+        assert is_same_team_id("bruins", "bos", "nba") is False
+        assert is_same_team_id("warriors", "golden state") is True
+        assert is_same_team_id("unknownfc", "unknownfc") is False  # no raw-name fallback
+
+    def test_single_league_aliases_agree(self):
+        """Test that one team's aliases resolve the same way through every API."""
+        assert get_canonical("uconn") == get_canonical("connecticut") == "uconn"
+        assert get_canonical_id("uconn") == get_canonical_id("connecticut") is not None
+        assert is_same_team("uconn", "connecticut") is True
+        assert is_same_team_id("uconn", "connecticut") is True
+        assert match_team_pairs([("uconn", "purdue")], [("connecticut", "purdue")]) == [(0, 0)]
+
+
+def _nested_loop_pairs(left, right, sport=None):
+    """Reference matcher: compare every pair with is_same_team."""
+    return [
+        (i, j)
+        for i, (a, b) in enumerate(left)
+        for j, (c, d) in enumerate(right)
+        if (is_same_team(a, c, sport) and is_same_team(b, d, sport))
+        or (is_same_team(a, d, sport) and is_same_team(b, c, sport))
+    ]
+
+
+class TestMatchTeamPairs:
+    """Test cases for match_team_pairs against the nested-loop reference."""
+
+    # NBA and NHL matchups whose teams share Kalshi codes (bos, wsh, chi, tor)
+    LEFT = [
+        ("celtics", "wizards"),
+        ("bruins", "capitals"),
+        ("bulls", "raptors"),
+        ("blackhawks", "maple leafs"),
+        ("lakers", "warriors"),
+    ]
+    RIGHT = [
+        ("capitals", "bruins"),       # NHL, reversed
+        ("wizards", "celtics"),       # NBA, reversed
+        ("maple leafs", "blackhawks"),
+        ("golden state", "la lakers"),
+        ("celtics", "capitals"),      # cross-league - must match nothing
+    ]
+
+    def test_mixed_leagues_match_nested_loop(self):
+        """Test the hash join agrees with is_same_team on a mixed-league fixture."""
+        expected = _nested_loop_pairs(self.LEFT, self.RIGHT)
+        assert sorted(match_team_pairs(self.LEFT, self.RIGHT)) == sorted(expected)
+        assert sorted(expected) == [(0, 1), (1, 0), (3, 2), (4, 3)]
+
+    @pytest.mark.parametrize("sport,left,right,expected", [
+        ("nba", [("bos", "wsh"), ("chi", "tor")], [("wizards", "celtics"), ("blackhawks", "maple leafs")], [(0, 0)]),
+        ("nhl", [("bos", "wsh"), ("chi", "tor")], [("wizards", "celtics"), ("blackhawks", "maple leafs")], [(1, 1)]),
+    ])
+    def test_codes_resolve_within_sport(self, sport, left, right, expected):
+        """Test that bare codes join only against the given sport's teams."""
+        assert sorted(match_team_pairs(left, right, sport)) == expected
+        assert sorted(_nested_loop_pairs(left, right, sport)) == expected
+
+
+class TestExtractTeamsFromSlug:
+    """Test cases for extract_teams_from_slug."""
+
+    def test_delimited_slug(self):
+        """Test that delimited slugs return the raw team segments."""
+        assert extract_teams_from_slug("nba-bos-lal-2025-01-15") == ("bos", "lal")
+
+    def test_undelimited_two_teams(self):
+        """Test the trie fallback returns alias text, like the delimited branch."""
+        assert extract_teams_from_slug("celticslakers") == ("celtics", "lakers")
+        assert extract_teams_from_slug("WarriorsCeltics") == ("warriors", "celtics")
+
+    @pytest.mark.parametrize("slug", [
+        "bostonceltics",   # same team twice
+        "bruinsceltics",   # shared code, different leagues
+        "lakers",          # only one team
+        "celticsfoo",      # trailing unknown text
+    ])
+    def test_undelimited_rejected(self, slug):
+        """Test that the fallback only accepts two different same-league teams."""
+        assert extract_teams_from_slug(slug) == (None, None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
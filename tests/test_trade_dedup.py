@@ -0,0 +1,44 @@
+"""Tests for trade deduplication."""
+
+import pytest
+from src.services.trade_dedup import SeenTrades
+
+
+class TestSeenTrades:
+    """Test cases for SeenTrades."""
+
+    def test_add_reports_new_only_once(self):
+        """Test that a trade ID is new only the first time."""
+        seen = SeenTrades()
+        assert seen.add("0xabc") is True
+        assert seen.add("0xabc") is False
+        assert "0xabc" in seen
+        assert len(seen) == 1
+
+    def test_oldest_evicted_at_capacity(self):
+        """Test least-recently-seen eviction once maxlen IDs are held."""
+        seen = SeenTrades(maxlen=3)
+        for tx in ("a", "b", "c", "d"):
+            seen.add(tx)
+
+        assert len(seen) == 3
+        assert "a" not in seen
+        assert "d" in seen
+        # Evicted ID counts as new again
+        assert seen.add("a") is True
+
+    def test_hit_refreshes_id(self):
+        """Test that an ID still being re-fetched survives a flood of new IDs."""
+        seen = SeenTrades(maxlen=3)
+        seen.add("quiet")
+        for tx in ("b", "c", "d", "e"):
+            assert seen.add("quiet") is False  # re-polled from the quiet wallet's feed
+            seen.add(tx)
+
+        assert "quiet" in seen
+        assert "b" not in seen
+        assert seen.add("quiet") is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])